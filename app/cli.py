@@ -41,11 +41,9 @@ def main():
     
     # Import message handler here to avoid circular imports
     from app.whatsapp.message_handler import MessageHandler
+    # Replies reach the console through mock_client.send_message
     message_handler = MessageHandler(mock_client)
     
-    # Override send_response method to print to console
-    message_handler._send_response = lambda _, message: mock_handler.send_response(message)
-    
     # Set a mock phone number for state tracking
     MOCK_PHONE = "123456789"
     
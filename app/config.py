@@ -44,6 +44,11 @@ TIME_ZONE = os.getenv('TIME_ZONE', 'Asia/Kolkata')  # Changed from 'UTC' to 'Asi
 DEBUG = os.getenv('DEBUG', 'False').lower() == 'true'
 SERVER_HOST = os.getenv('SERVER_HOST', '0.0.0.0')
 SERVER_PORT = int(os.getenv('SERVER_PORT', '5000'))
+WEBHOOK_WORKERS = int(os.getenv('WEBHOOK_WORKERS', '8'))  # Threads handling queued messages
+TWILIO_SEND_WORKERS = int(os.getenv('TWILIO_SEND_WORKERS', '16'))  # Threads for sends nobody waits on
+WEBHOOK_QUEUE_SIZE = int(os.getenv('WEBHOOK_QUEUE_SIZE', '1024'))  # Messages allowed to wait, split evenly across workers
+MAX_MEDIA_BYTES = int(os.getenv('MAX_MEDIA_BYTES', str(10 * 1024 * 1024)))  # Larger uploads are rejected
+CONVERSATION_TTL_SECONDS = int(os.getenv('CONVERSATION_TTL_SECONDS', '1800'))  # Abandoned flows expire after 30 min
 
 # Get default phone number for testing in CLI mode
 DEFAULT_PHONE_NUMBER = os.getenv('DEFAULT_PHONE_NUMBER', '1234567890')
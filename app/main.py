@@ -7,6 +7,10 @@ import signal
 import sys
 import time
 import argparse
+import atexit
+import logging
+import logging.handlers
+import queue
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -15,6 +19,29 @@ from app.whatsapp.webhook_server import WebhookServer
 from app.whatsapp.message_handler import MessageHandler
 from app.config import DEBUG, DEFAULT_PHONE_NUMBER
 
+def configure_logging():
+    """
+    Send log records through a queue to a background writer thread.
+    
+    Handlers only enqueue a record, so logging an error never blocks a
+    worker on writing to stderr.
+    """
+    log_queue = queue.Queue(-1)
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    
+    root = logging.getLogger()
+    # Replace the stream handler that modules' logging.basicConfig() installed
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(logging.DEBUG if DEBUG else logging.INFO)
+    
+    listener.start()
+    # Flush queued records when the application exits
+    atexit.register(listener.stop)
+
 def signal_handler(sig, frame):
     """Handle interrupt signals to exit gracefully."""
     print("\nExiting application...")
@@ -130,6 +157,8 @@ def main():
     
     args = parser.parse_args()
     
+    configure_logging()
+    
     # Register signal handlers for graceful exit
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
@@ -227,6 +227,21 @@ class EntityExtractor:
         
         return entities
     
+    def extract_datetime(self, message):
+        """
+        Extract date, time and duration with regexes and dateparser only.
+        
+        Skips the OpenRouter request and the NER model, for short replies
+        such as '3pm' or 'next Friday' that only need a date or time.
+        
+        Args:
+            message: The user message
+            
+        Returns:
+            Dict containing date, time, and duration entities
+        """
+        return self._extract_datetime(message)
+    
     def _extract_datetime(self, message):
         """
         Extract date and time information from a message.
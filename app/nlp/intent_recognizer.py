@@ -2,6 +2,8 @@
 Intent recognition for user messages using OpenAI and transformer models.
 """
 import re
+import threading
+import time
 import torch
 import numpy as np
 from transformers import AutoTokenizer, AutoModelForSequenceClassification
@@ -16,6 +18,80 @@ INTENT_CHECK_FREE_SLOTS = "check_free_slots"
 INTENT_PROCESS_TENDERS = "process_tenders"
 INTENT_UNKNOWN = "unknown"
 
+class _ZeroShotBatcher:
+    def __init__(self, score_batch, max_batch=32, max_wait=0.02):
+        """
+        Collect zero-shot requests from concurrent threads into batches.
+        
+        The first request of a batch waits up to max_wait seconds for others
+        to join, then a single background thread scores the whole batch.
+        
+        Args:
+            score_batch: Callable taking a list of messages and returning one
+                         row of scores per message
+            max_batch: Maximum number of messages per forward pass
+            max_wait: Seconds to wait for a batch to fill
+        """
+        self.score_batch = score_batch
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._pending = []
+        self._condition = threading.Condition()
+        self._worker = None
+    
+    def score(self, message):
+        """
+        Score one message, blocking until its batch has been run.
+        
+        Args:
+            message: The user message
+            
+        Returns:
+            Row of entailment scores, one per intent label
+        """
+        request = {"message": message, "done": threading.Event(), "scores": None, "error": None}
+        with self._condition:
+            self._pending.append(request)
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="intent-batcher")
+                self._worker.daemon = True
+                self._worker.start()
+            self._condition.notify()
+        
+        request["done"].wait()
+        if request["error"] is not None:
+            raise request["error"]
+        return request["scores"]
+    
+    def _run(self):
+        """Run batches for as long as the process lives."""
+        while True:
+            with self._condition:
+                while not self._pending:
+                    self._condition.wait()
+                
+                # Give concurrent callers a moment to join the batch
+                deadline = time.monotonic() + self.max_wait
+                while len(self._pending) < self.max_batch:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                
+                batch = self._pending[:self.max_batch]
+                del self._pending[:self.max_batch]
+            
+            try:
+                rows = self.score_batch([request["message"] for request in batch])
+                for request, scores in zip(batch, rows):
+                    request["scores"] = scores
+            except Exception as e:
+                for request in batch:
+                    request["error"] = e
+            finally:
+                for request in batch:
+                    request["done"].set()
+
 class IntentRecognizer:
     def __init__(self):
         """Initialize intent recognizers with primary and fallback models."""
@@ -52,6 +128,9 @@ class IntentRecognizer:
             # Initialize model
             self.model.eval()
             
+            # Concurrent fallback classifications share forward passes
+            self._batcher = _ZeroShotBatcher(self._zero_shot_scores)
+            
             # Set initialization flag
             self.initialized = True
             print("Advanced transformer model for intent recognition loaded successfully")
@@ -94,25 +173,8 @@ class IntentRecognizer:
             if result:
                 return result
                 
-            # Zero-shot classification approach
-            premise = message
-            hypothesis_template = "This text is about {}."
-            
-            # Prepare inputs for the model
-            inputs = self.tokenizer(
-                [premise] * len(self.intent_labels),
-                [hypothesis_template.format(label) for label in self.intent_labels],
-                return_tensors="pt",
-                padding=True,
-                truncation=True
-            )
-            
-            # Get model predictions
-            with torch.no_grad():
-                outputs = self.model(**inputs)
-                predictions = torch.nn.functional.softmax(outputs.logits, dim=1)
-                entailment_idx = 2  # Index for entailment in MNLI model
-                scores = predictions[:, entailment_idx]
+            # Zero-shot classification, batched with other threads' messages
+            scores = self._batcher.score(message)
                 
             # Get the best intent and its confidence
             best_idx = torch.argmax(scores).item()
@@ -137,6 +199,36 @@ class IntentRecognizer:
             # Fall back to rule-based approach
             return self._recognize_intent_rule_based(message)
     
+    def _zero_shot_scores(self, messages):
+        """
+        Score every intent label for several messages in one forward pass.
+        
+        Args:
+            messages: List of user messages
+            
+        Returns:
+            Tensor of entailment scores, one row per message and one column
+            per intent label
+        """
+        hypothesis_template = "This text is about {}."
+        labels = self.intent_labels
+        
+        # One (premise, hypothesis) pair per message and label, grouped by message
+        inputs = self.tokenizer(
+            [message for message in messages for _ in labels],
+            [hypothesis_template.format(label) for _ in messages for label in labels],
+            return_tensors="pt",
+            padding=True,
+            truncation=True
+        )
+        
+        # Get model predictions
+        with torch.no_grad():
+            outputs = self.model(**inputs)
+            predictions = torch.nn.functional.softmax(outputs.logits, dim=1)
+            entailment_idx = 2  # Index for entailment in MNLI model
+            return predictions[:, entailment_idx].view(len(messages), len(labels))
+    
     def _check_quick_keywords(self, message):
         """Check for strong keywords that clearly indicate an intent."""
         text = message.lower()
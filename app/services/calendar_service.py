@@ -2,20 +2,26 @@
 Calendar service for managing events using Google Calendar API.
 """
 import datetime
+import threading
+from itertools import islice
 import pytz
 from googleapiclient.errors import HttpError
 
 from app.utils.auth import get_calendar_service
+from app.utils.ttl_cache import TTLCache
 from app.utils.helpers import (
     format_datetime, 
     format_date, 
     format_time,
-    create_time_slot_range,
     get_weekday_name,
     get_current_time
 )
 from app.config import TIME_ZONE
 
+# Seconds a queried time range stays cached; creating an event clears the cache
+EVENTS_CACHE_TTL = 60
+EVENTS_CACHE_SIZE = 256
+
 class CalendarService:
     def __init__(self):
         """Initialize the calendar service with Google Calendar API."""
@@ -23,6 +29,12 @@ class CalendarService:
         self.timezone = pytz.timezone(TIME_ZONE)
         if not self.service:
             print("Failed to initialize Calendar service")
+        
+        # (time_min, time_max) -> busy periods; the generation counts
+        # clears so a fetch that raced with one isn't stored
+        self._events_cache = TTLCache(EVENTS_CACHE_SIZE, EVENTS_CACHE_TTL)
+        self._events_cache_lock = threading.Lock()
+        self._events_cache_generation = 0
     
     def create_event(self, summary, start_time, end_time, description=None, 
                  location=None, attendees=None, send_notifications=True):
@@ -129,6 +141,9 @@ class CalendarService:
                 conferenceDataVersion=1  # This enables Meet link generation
             ).execute()
             
+            # Cached ranges may now be missing this event
+            self._clear_events_cache()
+            
             # Extract the Google Meet link
             meet_link = None
             if 'conferenceData' in event and 'entryPoints' in event['conferenceData']:
@@ -149,6 +164,51 @@ class CalendarService:
         except Exception as e:
             return {"success": False, "error": f"Error creating event: {e}"}
     
+    def get_busy_periods(self, time_min, time_max):
+        """
+        Get busy periods in a time range, cached for EVENTS_CACHE_TTL seconds.
+        
+        Uses freebusy.query, which returns only busy intervals instead of
+        full event resources. Repeated availability checks in one
+        conversation ("no, 3pm instead") are answered from the cache
+        instead of another Calendar API call.
+        
+        Args:
+            time_min: Start of the range (timezone-aware datetime)
+            time_max: End of the range (timezone-aware datetime)
+            
+        Returns:
+            List of (start, end) timezone-aware datetime tuples
+        """
+        key = (time_min.isoformat(), time_max.isoformat())
+        with self._events_cache_lock:
+            cached = self._events_cache.get(key)
+            if cached is not None:
+                return cached
+            generation = self._events_cache_generation
+        
+        freebusy_result = self.service.freebusy().query(body={
+            'timeMin': key[0],
+            'timeMax': key[1],
+            'timeZone': str(self.timezone),
+            'items': [{'id': 'primary'}]
+        }).execute()
+        busy = freebusy_result.get('calendars', {}).get('primary', {}).get('busy', [])
+        periods = [(self._parse_api_time(period['start']), self._parse_api_time(period['end'])) for period in busy]
+        
+        with self._events_cache_lock:
+            # Don't cache a result that raced with a new event being created
+            if generation == self._events_cache_generation:
+                self._events_cache.set(key, periods)
+        
+        return periods
+    
+    def _clear_events_cache(self):
+        """Forget all cached busy periods."""
+        with self._events_cache_lock:
+            self._events_cache.clear()
+            self._events_cache_generation += 1
+    
     def get_events(self, start_date=None, end_date=None, max_results=10):
         """
         Get calendar events for a specific date range.
@@ -266,48 +326,116 @@ class CalendarService:
         day_end = datetime.datetime.combine(date, end_time)
         day_end = self.timezone.localize(day_end)
         
-        # Get all slots for the day
-        all_slots = create_time_slot_range(day_start, day_end, duration_minutes)
-        
-        # Get events for the day
-        events = self.get_events(
-            start_date=day_start,
-            end_date=day_end
-        )
-        
-        # Mark busy slots
-        busy_slots = []
-        for event in events:
-            event_start = event['start']
-            event_end = event['end']
-            
-            # Convert to datetime objects if they are strings
-            if isinstance(event_start, str):
-                event_start = datetime.datetime.fromisoformat(event_start.replace('Z', '+00:00'))
-                event_start = event_start.astimezone(self.timezone)
-                
-            if isinstance(event_end, str):
-                event_end = datetime.datetime.fromisoformat(event_end.replace('Z', '+00:00'))
-                event_end = event_end.astimezone(self.timezone)
+        # Busy periods come from the same cached day query as
+        # check_availability, so both only cost one Calendar API call
+        try:
+            busy_slots = self._day_busy_slots(date)
+        except Exception as e:
+            print(f"Error getting calendar events: {e}")
+            busy_slots = []
+        
+        return self._free_slots_between(day_start, day_end, duration_minutes, busy_slots)
+    
+    def check_availability(self, start_dt, end_dt, day_start_time, day_end_time, duration_minutes=30,
+                           max_slots=None):
+        """
+        Check a proposed meeting slot and find alternatives with one API call.
+        
+        A single free/busy query for the whole day answers both whether the
+        slot is taken and which other slots are free, instead of one query
+        for the conflict check and another for the alternatives.
+        
+        Args:
+            start_dt: Proposed start (timezone-aware datetime)
+            end_dt: Proposed end (timezone-aware datetime)
+            day_start_time: Start of the window searched for alternatives (time object)
+            day_end_time: End of the window searched for alternatives (time object)
+            duration_minutes: Duration of each alternative slot in minutes
+            max_slots: Stop searching after this many free slots (default: all)
             
-            # Add to busy slots
-            busy_slots.append((event_start, event_end))
+        Returns:
+            Tuple of (has_conflict, free_slots); free_slots lists (start, end)
+            datetime tuples and is empty when there is no conflict
+        """
+        date = start_dt.date()
+        busy_slots = self._day_busy_slots(date, end_dt)
         
-        # Find free slots
-        free_slots = []
-        for slot_start, slot_end in all_slots:
-            is_free = True
+        has_conflict = any(start_dt < busy_end and end_dt > busy_start for busy_start, busy_end in busy_slots)
+        if not has_conflict:
+            return False, []
+        
+        day_start = self.timezone.localize(datetime.datetime.combine(date, day_start_time))
+        day_end = self.timezone.localize(datetime.datetime.combine(date, day_end_time))
+        free_slots = self._iter_free_slots(day_start, day_end, duration_minutes, busy_slots)
+        if max_slots is not None:
+            free_slots = islice(free_slots, max_slots)
+        return True, list(free_slots)
+    
+    def _day_busy_slots(self, date, until=None):
+        """
+        Return the busy periods of a whole local day from the cache.
+        
+        Every caller queries the full day, whatever working hours it then
+        searches, so they all hit the same cache entry.
+        
+        Args:
+            date: The day to list (date object)
+            until: Optional timezone-aware datetime to extend the query to
+            
+        Returns:
+            List of (start, end) datetime tuples
+        """
+        time_min = self.timezone.localize(datetime.datetime.combine(date, datetime.time.min))
+        time_max = self.timezone.localize(datetime.datetime.combine(date, datetime.time.max))
+        if until is not None and until > time_max:
+            time_max = until
+        return self.get_busy_periods(time_min, time_max)
+    
+    def _parse_api_time(self, value):
+        """Return an RFC 3339 timestamp from the API as a local datetime."""
+        return datetime.datetime.fromisoformat(value.replace('Z', '+00:00')).astimezone(self.timezone)
+    
+    def _free_slots_between(self, day_start, day_end, duration_minutes, busy_slots):
+        """
+        Split a time window into slots and keep the ones clear of busy periods.
+        
+        Args:
+            day_start: Start of the window (timezone-aware datetime)
+            day_end: End of the window (timezone-aware datetime)
+            duration_minutes: Duration of each slot in minutes
+            busy_slots: List of (start, end) datetime tuples
             
-            for busy_start, busy_end in busy_slots:
-                # Check if slot overlaps with any busy period
-                if (slot_start < busy_end and slot_end > busy_start):
-                    is_free = False
-                    break
+        Returns:
+            List of available time slots as (start, end) datetime tuples
+        """
+        return list(self._iter_free_slots(day_start, day_end, duration_minutes, busy_slots))
+    
+    def _iter_free_slots(self, day_start, day_end, duration_minutes, busy_slots):
+        """
+        Yield the slots of a time window that are clear of busy periods.
+        
+        Slots are produced lazily in time order, so a caller that only needs
+        the first few stops the scan there.
+        
+        Args:
+            day_start: Start of the window (timezone-aware datetime)
+            day_end: End of the window (timezone-aware datetime)
+            duration_minutes: Duration of each slot in minutes
+            busy_slots: List of (start, end) datetime tuples
             
-            if is_free:
-                free_slots.append((slot_start, slot_end))
+        Yields:
+            Available time slots as (start, end) datetime tuples
+        """
+        duration = datetime.timedelta(minutes=duration_minutes)
         
-        return free_slots
+        # Whole slots that fit in the window; a partial slot at the end is dropped
+        for i in range((day_end - day_start) // duration):
+            slot_start = day_start + i * duration
+            slot_end = slot_start + duration
+            
+            # Check if slot overlaps with any busy period
+            if not any(slot_start < busy_end and slot_end > busy_start for busy_start, busy_end in busy_slots):
+                yield slot_start, slot_end
     
     def format_free_slots(self, free_slots):
         """
@@ -44,6 +44,15 @@ class ContactsDBService:
             )
             ''')
             
+            # Create table of remembered Google lookups by name
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS contact_lookups (
+                name TEXT PRIMARY KEY,
+                contact TEXT,
+                cached_at REAL
+            )
+            ''')
+            
             conn.commit()
             conn.close()
             return True
@@ -342,4 +351,56 @@ class ContactsDBService:
             
         except Exception as e:
             print(f"Error getting contact details from local DB: {e}")
-            return None
\ No newline at end of file
+            return None
+
+    def get_cached_lookup(self, name, max_age):
+        """
+        Get a remembered Google lookup result for a name.
+        
+        Args:
+            name: Normalized contact name the lookup was stored under
+            max_age: Seconds after which a stored result is ignored
+        
+        Returns:
+            Contact dict, or None if nothing fresh is stored
+        """
+        if not self.initialized:
+            return None
+        
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            cursor.execute(
+                'SELECT contact FROM contact_lookups WHERE name = ? AND cached_at > ?',
+                (name, time.time() - max_age)
+            )
+            row = cursor.fetchone()
+            conn.close()
+            return json.loads(row[0]) if row else None
+        
+        except Exception as e:
+            print(f"Error reading cached contact lookup: {e}")
+            return None
+    
+    def cache_lookup(self, name, contact):
+        """
+        Remember a Google lookup result so it survives restarts.
+        
+        Args:
+            name: Normalized contact name to store the result under
+            contact: Contact dict returned by the lookup
+        """
+        if not self.initialized:
+            return
+        
+        try:
+            conn = sqlite3.connect(self.db_path)
+            conn.execute(
+                'INSERT OR REPLACE INTO contact_lookups (name, contact, cached_at) VALUES (?, ?, ?)',
+                (name, json.dumps(contact), time.time())
+            )
+            conn.commit()
+            conn.close()
+        
+        except Exception as e:
+            print(f"Error caching contact lookup: {e}")
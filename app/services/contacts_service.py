@@ -1,17 +1,127 @@
 """
 Contacts service for accessing Google Contacts.
 """
+import logging
+import threading
+import time
+from collections import OrderedDict
+
 from googleapiclient.errors import HttpError
 
 from app.utils.auth import get_contacts_service
 from app.utils.helpers import normalize_name
 
+# Seconds before the prefetched connections are refreshed with a delta sync
+CONNECTIONS_REFRESH_SECONDS = 300
+CONNECTION_FIELDS = 'names,emailAddresses,phoneNumbers'
+
+# Full fetches and delta syncs must send the same parameters; Google rejects
+# a sync token used with a different request
+_CONNECTIONS_REQUEST = {
+    'resourceName': 'people/me',
+    'pageSize': 1000,  # Maximum page size
+    'personFields': CONNECTION_FIELDS,
+    'sortOrder': 'LAST_MODIFIED_DESCENDING',
+    'requestSyncToken': True,
+}
+
+logger = logging.getLogger(__name__)
+
 class ContactsService:
     def __init__(self):
         """Initialize the contacts service with Google People API."""
         self.service = get_contacts_service()
         if not self.service:
             print("Failed to initialize Contacts service")
+        
+        # resourceName -> person, in the order Google first returned them
+        self._connections = OrderedDict()
+        self._connections_lock = threading.Lock()
+        self._connections_synced_at = None
+        self._sync_token = None
+    
+    def prefetch_all(self):
+        """
+        Fetch every connection once and keep them for local searches.
+        
+        Later calls within CONNECTIONS_REFRESH_SECONDS reuse the stored
+        connections. After that only the contacts changed since the last
+        sync are fetched, using the sync token Google returned.
+        
+        Returns:
+            List of People API person resources
+        """
+        with self._connections_lock:
+            fresh = (
+                self._connections_synced_at is not None
+                and time.monotonic() - self._connections_synced_at < CONNECTIONS_REFRESH_SECONDS
+            )
+            if not fresh:
+                synced_at = time.monotonic()
+                if self._sync_token:
+                    try:
+                        self._sync_changes()
+                    except HttpError as e:
+                        # An expired sync token (410) needs a full fetch
+                        logger.warning("Contacts delta sync failed, refetching all: %s", e)
+                        self._fetch_all()
+                else:
+                    self._fetch_all()
+                self._connections_synced_at = synced_at
+            
+            return list(self._connections.values())
+    
+    def _fetch_all(self):
+        """Replace the stored connections with a full paginated fetch (lock held)."""
+        print("Fetching contacts with pagination...")
+        connections = OrderedDict()
+        next_page_token = None
+        while True:
+            results = self.service.people().connections().list(
+                pageToken=next_page_token,
+                **_CONNECTIONS_REQUEST
+            ).execute()
+            
+            batch = results.get('connections', [])
+            for person in batch:
+                connections[person.get('resourceName')] = person
+            if batch:
+                print(f"  - Fetched batch of {len(batch)} contacts")
+            
+            next_page_token = results.get('nextPageToken')
+            if not next_page_token or not batch:
+                break
+        
+        self._connections = connections
+        self._sync_token = results.get('nextSyncToken')
+        print(f"Total contacts found: {len(connections)}")
+    
+    def _sync_changes(self):
+        """Apply contacts changed since the last sync token (lock held)."""
+        next_page_token = None
+        changed = 0
+        while True:
+            results = self.service.people().connections().list(
+                pageToken=next_page_token,
+                syncToken=self._sync_token,
+                **_CONNECTIONS_REQUEST
+            ).execute()
+            
+            for person in results.get('connections', []):
+                resource_name = person.get('resourceName')
+                if person.get('metadata', {}).get('deleted'):
+                    self._connections.pop(resource_name, None)
+                else:
+                    self._connections[resource_name] = person
+                changed += 1
+            
+            next_page_token = results.get('nextPageToken')
+            if not next_page_token:
+                break
+        
+        self._sync_token = results.get('nextSyncToken', self._sync_token)
+        if changed:
+            print(f"Synced {changed} changed contacts")
     
     def search_contacts(self, query, max_results=10):
         """Improved contact search with strict matching and pagination support"""
@@ -23,30 +133,9 @@ class ContactsService:
             original_query = query  # Store original query for exact matching
             normalized_query = normalize_name(query)
             
-            # Get ALL contacts with pagination
-            connections = []
-            next_page_token = None
-            
-            print("Fetching contacts with pagination...")
-            while True:
-                results = self.service.people().connections().list(
-                    resourceName='people/me',
-                    pageSize=1000,  # Maximum page size
-                    personFields='names,emailAddresses,phoneNumbers',
-                    pageToken=next_page_token,
-                    sortOrder='LAST_MODIFIED_DESCENDING'
-                ).execute()
-                
-                batch = results.get('connections', [])
-                if batch:
-                    connections.extend(batch)
-                    print(f"  - Fetched batch of {len(batch)} contacts")
-                
-                next_page_token = results.get('nextPageToken')
-                if not next_page_token or not batch:
-                    break
-            
-            print(f"Total contacts found: {len(connections)}")
+            # Search the prefetched connections instead of paging through
+            # every contact on each call
+            connections = self.prefetch_all()
             
             # Create three tiers of matches
             exact_matches = []      # Perfect matches or exact substrings
@@ -1,20 +1,49 @@
 """
 Email service for sending and retrieving emails using Gmail API.
 """
-import base64
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from googleapiclient.errors import HttpError
 
+# pybase64 is a SIMD-accelerated drop-in for the stdlib base64 functions
+try:
+    import pybase64 as base64
+except ImportError:
+    import base64
+
 from app.utils.auth import get_gmail_service
 from app.utils.helpers import summarize_text, is_valid_email
 
+# Gmail API accepts at most this many sends per batch HTTP request
+GMAIL_BATCH_SIZE = 50
+
+class _NullGmailService:
+    """Stand-in used when Gmail authentication fails."""
+    
+    def send_email(self, to, subject, body, cc=None, bcc=None):
+        return {"success": False, "error": "Gmail service not initialized"}
+    
+    def send_bulk(self, messages):
+        return [{"success": False, "error": "Gmail service not initialized"} for _ in messages]
+    
+    def get_recent_emails(self, max_results=10):
+        return []
+    
+    def get_email_content(self, message_id):
+        return None
+
 class EmailService:
     def __init__(self):
         """Initialize the email service with Gmail API."""
         self.service = get_gmail_service()
         if not self.service:
             print("Failed to initialize Gmail service")
+            # Resolve the missing-service case once instead of on every call
+            null_service = _NullGmailService()
+            self.send_email = null_service.send_email
+            self.send_bulk = null_service.send_bulk
+            self.get_recent_emails = null_service.get_recent_emails
+            self.get_email_content = null_service.get_email_content
     
     def send_email(self, to, subject, body, cc=None, bcc=None):
         """
@@ -30,39 +59,17 @@ class EmailService:
         Returns:
             Dict containing success status and message ID if successful
         """
-        if not self.service:
-            return {"success": False, "error": "Gmail service not initialized"}
-        
         # Convert single email to list
         if isinstance(to, str):
             to = [to]
         
         # Validate email addresses
-        for email in to:
-            if not is_valid_email(email):
-                return {"success": False, "error": f"Invalid email address: {email}"}
+        invalid = self._find_invalid_address(to)
+        if invalid:
+            return {"success": False, "error": f"Invalid email address: {invalid}"}
         
         try:
-            # Create message
-            message = MIMEMultipart()
-            message['to'] = ', '.join(to)
-            message['subject'] = subject
-            
-            if cc:
-                if isinstance(cc, str):
-                    cc = [cc]
-                message['cc'] = ', '.join(cc)
-                
-            if bcc:
-                if isinstance(bcc, str):
-                    bcc = [bcc]
-                message['bcc'] = ', '.join(bcc)
-            
-            # Attach body
-            message.attach(MIMEText(body, 'html'))
-            
-            # Encode message
-            raw_message = base64.urlsafe_b64encode(message.as_bytes()).decode()
+            raw_message = self._build_raw_message(to, subject, body, cc, bcc)
             
             # Send message
             sent_message = self.service.users().messages().send(
@@ -81,6 +88,117 @@ class EmailService:
         except Exception as e:
             return {"success": False, "error": f"Error sending email: {e}"}
     
+    def send_bulk(self, messages):
+        """
+        Send several independent emails using Gmail API batch requests.
+        
+        Args:
+            messages: List of dicts with 'to', 'subject' and 'body' keys
+                      and optional 'cc' and 'bcc' keys
+            
+        Returns:
+            List of result dicts in the same order as messages, each shaped
+            like the return value of send_email
+        """
+        results = [None] * len(messages)
+        messages_api = self.service.users().messages()
+        pending = []
+        
+        # Validate and encode everything before touching the network
+        for index, message in enumerate(messages):
+            to = message['to']
+            if isinstance(to, str):
+                to = [to]
+            
+            invalid = self._find_invalid_address(to)
+            if invalid:
+                results[index] = {"success": False, "error": f"Invalid email address: {invalid}"}
+                continue
+            
+            try:
+                raw_message = self._build_raw_message(
+                    to, message['subject'], message['body'],
+                    message.get('cc'), message.get('bcc')
+                )
+            except Exception as e:
+                results[index] = {"success": False, "error": f"Error sending email: {e}"}
+                continue
+            
+            pending.append((index, raw_message))
+        
+        def on_sent(request_id, response, exception):
+            if exception is not None:
+                error = f"Gmail API error: {exception}" if isinstance(exception, HttpError) \
+                    else f"Error sending email: {exception}"
+                results[int(request_id)] = {"success": False, "error": error}
+            else:
+                results[int(request_id)] = {
+                    "success": True,
+                    "message_id": response.get('id'),
+                    "thread_id": response.get('threadId')
+                }
+        
+        # Pack up to GMAIL_BATCH_SIZE sends into each HTTP request
+        for start in range(0, len(pending), GMAIL_BATCH_SIZE):
+            chunk = pending[start:start + GMAIL_BATCH_SIZE]
+            batch = self.service.new_batch_http_request(callback=on_sent)
+            for index, raw_message in chunk:
+                batch.add(
+                    messages_api.send(userId='me', body={'raw': raw_message}),
+                    request_id=str(index)
+                )
+            
+            try:
+                batch.execute()
+            except Exception as e:
+                for index, _ in chunk:
+                    if results[index] is None:
+                        results[index] = {"success": False, "error": f"Error sending email: {e}"}
+        
+        return results
+    
+    def _find_invalid_address(self, addresses):
+        """Return the first invalid address in the list, or None if all are valid."""
+        for email in addresses:
+            is_valid, _, _ = is_valid_email(email)
+            if not is_valid:
+                return email
+        return None
+    
+    def _build_raw_message(self, to, subject, body, cc=None, bcc=None):
+        """
+        Build a base64url-encoded MIME message for the Gmail API.
+        
+        Args:
+            to: List of recipient email addresses
+            subject: Email subject
+            body: Email body (HTML or plain text)
+            cc: Carbon copy recipients (optional)
+            bcc: Blind carbon copy recipients (optional)
+            
+        Returns:
+            The encoded message, ready for the 'raw' field
+        """
+        message = MIMEMultipart()
+        message['to'] = ', '.join(to)
+        message['subject'] = subject
+        
+        if cc:
+            if isinstance(cc, str):
+                cc = [cc]
+            message['cc'] = ', '.join(cc)
+            
+        if bcc:
+            if isinstance(bcc, str):
+                bcc = [bcc]
+            message['bcc'] = ', '.join(bcc)
+        
+        # Attach body
+        message.attach(MIMEText(body, 'html'))
+        
+        # Encode message
+        return base64.urlsafe_b64encode(message.as_bytes()).decode()
+    
     def get_recent_emails(self, max_results=10):
         """
         Retrieve recent emails from the inbox.
@@ -91,12 +209,12 @@ class EmailService:
         Returns:
             List of email objects with basic information
         """
-        if not self.service:
-            return []
-            
         try:
+            # Resolve the messages resource once for the list and per-message calls
+            messages_api = self.service.users().messages()
+            
             # Get list of messages
-            results = self.service.users().messages().list(
+            results = messages_api.list(
                 userId='me',
                 labelIds=['INBOX'],
                 maxResults=max_results
@@ -107,7 +225,7 @@ class EmailService:
             
             # Get details for each message
             for message in messages:
-                msg = self.service.users().messages().get(
+                msg = messages_api.get(
                     userId='me', 
                     id=message['id']
                 ).execute()
@@ -149,9 +267,6 @@ class EmailService:
         Returns:
             Dict containing email details and content
         """
-        if not self.service:
-            return None
-            
         try:
             # Get message
             message = self.service.users().messages().get(
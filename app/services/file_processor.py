@@ -3,17 +3,25 @@ Service for processing file uploads from WhatsApp.
 """
 import os
 import tempfile
-import requests
 import logging
-from datetime import datetime, timedelta
 
+from app.config import MAX_MEDIA_BYTES, TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN
+from app.services.tender_pipeline import TenderPipeline
 from app.utils.file_parsers import parse_csv, parse_excel
-from app.whatsapp.twilio_client import send_whatsapp_message
+from app.utils.http_session import session as http_session
+from app.whatsapp.twilio_client import send_whatsapp_message, send_whatsapp_message_async
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Size of each chunk written to disk while downloading media
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+def _file_too_large_message():
+    """Return the error shown for uploads over MAX_MEDIA_BYTES."""
+    return f"File too large (max {MAX_MEDIA_BYTES // (1024 * 1024)}MB)"
+
 class FileProcessor:
     def __init__(self, calendar_service=None):
         """
@@ -39,24 +47,51 @@ class FileProcessor:
         logger.info(f"Processing file from URL: {file_url}")
         
         try:
-            # First, send an acknowledgment message
-            send_whatsapp_message(sender_id, "I've received your file. Processing it now...")
+            auth = (TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN)
             
-            # Download the file
-            from app.config import TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN
-            response = requests.get(file_url, auth=(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN), timeout=30)
-            if response.status_code != 200:
-                error_msg = f"Failed to download file: HTTP {response.status_code}"
+            # Reject oversized files before downloading any of the body
+            error_msg = self._check_file_size(file_url, auth)
+            if error_msg:
                 logger.error(error_msg)
                 send_whatsapp_message(sender_id, f"❌ {error_msg}")
                 return {"successful": 0, "failed": 0, "error": error_msg}
             
-            # Create a temporary file
-            with tempfile.NamedTemporaryFile(delete=False) as temp_file:
-                temp_file.write(response.content)
-                temp_path = temp_file.name
+            # Send the acknowledgment while the download is in flight
+            ack = send_whatsapp_message_async(sender_id, "I've received your file. Processing it now...")
             
+            # The temp file is removed however the download or parse ends
+            temp_path = None
             try:
+                # Download the file straight to disk
+                written = 0
+                try:
+                    with http_session.get(file_url, auth=auth, timeout=30, stream=True) as response:
+                        if response.status_code != 200:
+                            error_msg = f"Failed to download file: HTTP {response.status_code}"
+                            logger.error(error_msg)
+                            ack.result()
+                            send_whatsapp_message(sender_id, f"❌ {error_msg}")
+                            return {"successful": 0, "failed": 0, "error": error_msg}
+                    
+                        # Create a temporary file
+                        with tempfile.NamedTemporaryFile(delete=False) as temp_file:
+                            temp_path = temp_file.name
+                            for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                                written += len(chunk)
+                                # The size check can't catch hosts that omit Content-Length
+                                if written > MAX_MEDIA_BYTES:
+                                    break
+                                temp_file.write(chunk)
+                finally:
+                    # Keep the acknowledgment ahead of any result message
+                    ack.result()
+            
+                if written > MAX_MEDIA_BYTES:
+                    error_msg = _file_too_large_message()
+                    logger.error(error_msg)
+                    send_whatsapp_message(sender_id, f"❌ {error_msg}")
+                    return {"successful": 0, "failed": 0, "error": error_msg}
+            
                 # Process based on file type
                 if content_type == 'text/csv':
                     tenders = parse_csv(temp_path)
@@ -74,24 +109,28 @@ class FileProcessor:
                 else:
                     # For demo/testing, just log the tenders
                     logger.info(f"Parsed tenders: {tenders}")
-                    message = f"✅ Successfully parsed {len(tenders)} tenders from your file.\n\n"
-                    message += "Note: Calendar integration is not configured, so no events were created.\n\n"
-                    message += "Sample tenders:\n"
-                    
-                    for i, tender in enumerate(tenders[:3], 1):
-                        message += f"{i}. {tender['tender_name']} - {tender['bidding_date']}\n"
+                    parts = [
+                        f"✅ Successfully parsed {len(tenders)} tenders from your file.\n\n",
+                        "Note: Calendar integration is not configured, so no events were created.\n\n",
+                        "Sample tenders:\n"
+                    ]
+                    parts.extend(
+                        f"{i}. {tender['tender_name']} - {tender['bidding_date']}\n"
+                        for i, tender in enumerate(tenders[:3], 1)
+                    )
                     
                     if len(tenders) > 3:
-                        message += f"...and {len(tenders) - 3} more"
+                        parts.append(f"...and {len(tenders) - 3} more")
                         
-                    send_whatsapp_message(sender_id, message)
+                    send_whatsapp_message(sender_id, "".join(parts))
                     
                     results = {"successful": len(tenders), "failed": 0}
             
             finally:
                 # Clean up the temp file
                 try:
-                    os.unlink(temp_path)
+                    if temp_path:
+                        os.unlink(temp_path)
                 except Exception as e:
                     logger.warning(f"Failed to delete temp file {temp_path}: {e}")
             
@@ -103,103 +142,42 @@ class FileProcessor:
             send_whatsapp_message(sender_id, f"❌ {error_msg}")
             return {"successful": 0, "failed": 0, "error": str(e)}
     
-    def _create_calendar_events(self, tenders, sender_id):
+    def _check_file_size(self, file_url, auth):
         """
-        Create calendar events for tenders.
+        Ask the media host for a file's size without downloading it.
         
         Args:
-            tenders (list): List of tender dictionaries
-            sender_id (str): Sender's phone number
+            file_url (str): URL to the file
+            auth (tuple): Credentials for the media host
             
         Returns:
-            dict: Results with counts of successful and failed events
+            str: Error message if the file is too large, otherwise None
         """
-        if not self.calendar_service:
-            return {"successful": 0, "failed": 0, "error": "Calendar service not configured"}
-            
-        successful = []
-        failed = []
-        
-        for tender in tenders:
-            try:
-                # Parse bidding date
-                try:
-                    from app.utils.file_parsers import parse_date
-                    bidding_date = parse_date(tender['bidding_date'])
-                except ValueError:
-                    failed.append({
-                        'tender': tender['tender_name'],
-                        'reason': f"Invalid date format: {tender['bidding_date']}"
-                    })
-                    continue
-                
-                # Calculate reminder date (3 days before)
-                reminder_date = bidding_date - timedelta(days=3)
-                
-                # Create calendar event with default times for tender reminders
-                summary = f"Tender: {tender['tender_name']}"
-                start_time = bidding_date.replace(hour=0, minute=0, second=0, microsecond=0)
-                end_time = bidding_date.replace(hour=23, minute=59, second=0, microsecond=0)
-                event_id = self.calendar_service.create_event(
-                    summary,
-                    start_time,
-                    end_time
-                )
-                
-                if event_id:
-                    successful.append({
-                        'tender': tender['tender_name'],
-                        'date': bidding_date.strftime('%Y-%m-%d')
-                    })
-                else:
-                    failed.append({
-                        'tender': tender['tender_name'],
-                        'reason': 'Failed to create calendar event'
-                    })
-                
-            except Exception as e:
-                logger.error(f"Error creating event for tender {tender['tender_name']}: {str(e)}")
-                failed.append({
-                    'tender': tender['tender_name'],
-                    'reason': str(e)
-                })
-        
-        # Send results to user
-        self._send_processing_results(successful, failed, sender_id)
+        try:
+            head = http_session.head(file_url, auth=auth, timeout=5, allow_redirects=True)
+            size = int(head.headers.get('Content-Length') or 0)
+        except Exception as e:
+            # Not fatal; the download enforces the limit as it streams
+            logger.warning(f"Could not check size of {file_url}: {e}")
+            return None
         
-        return {
-            'successful': len(successful),
-            'failed': len(failed)
-        }
+        if head.status_code == 200 and size > MAX_MEDIA_BYTES:
+            return _file_too_large_message()
+        return None
     
-    def _send_processing_results(self, successful, failed, sender_id):
+    def _create_calendar_events(self, tenders, sender_id):
         """
-        Send processing results to the user.
+        Create calendar events for tenders.
         
         Args:
-            successful (list): List of successfully processed tenders
-            failed (list): List of failed tenders
+            tenders (list): List of tender dictionaries
             sender_id (str): Sender's phone number
-        """
-        message = f"✅ Processed your tender file.\n\n"
-        
-        if successful:
-            message += f"Successfully created {len(successful)} reminder(s):\n"
-            # Show up to 5 examples
-            for i, item in enumerate(successful[:5], 1):
-                message += f"{i}. {item['tender']} (Due: {item['date']})\n"
             
-            if len(successful) > 5:
-                message += f"...and {len(successful) - 5} more\n"
+        Returns:
+            dict: Results with counts of successful and failed events
+        """
+        if not self.calendar_service:
+            return {"successful": 0, "failed": 0, "error": "Calendar service not configured"}
         
-        if failed:
-            message += f"\n❌ Failed to process {len(failed)} item(s):\n"
-            # Show up to 3 examples
-            for i, item in enumerate(failed[:3], 1):
-                message += f"{i}. {item['tender']}: {item['reason']}\n"
-            
-            if len(failed) > 3:
-                message += f"...and {len(failed) - 3} more\n"
-                
-        # Send the message
-        send_whatsapp_message(sender_id, message)
\ No newline at end of file
+        pipeline = TenderPipeline(self.calendar_service.create_event)
+        return pipeline.process(tenders, sender_id)
@@ -0,0 +1,167 @@
+"""
+Shared pipeline for turning parsed tenders into calendar reminders.
+"""
+import re
+import logging
+from datetime import datetime
+
+from app.utils.file_parsers import parse_date
+from app.whatsapp.twilio_client import send_whatsapp_message
+
+logger = logging.getLogger(__name__)
+
+# Supported bidding date layouts: YYYY-MM-DD, or DD/MM/YYYY and MM/DD/YYYY
+# with a consistent '/' or '-' separator
+_DATE_RE = re.compile(r'^(?:(\d{4})-(\d{1,2})-(\d{1,2})|(\d{1,2})([/-])(\d{1,2})\5(\d{4}))$')
+
+REQUIRED_FIELDS = ['tender_name', 'email', 'bidding_date']
+
+class TenderPipeline:
+    def __init__(self, create_event):
+        """
+        Initialize the tender pipeline.
+        
+        Args:
+            create_event: Callable with the CalendarService.create_event signature
+        """
+        self.create_event = create_event
+    
+    def process(self, tenders, sender_id, failed=None):
+        """
+        Create calendar reminders for tenders and report the results.
+        
+        Args:
+            tenders (list): List of tender dictionaries
+            sender_id (str): Sender's phone number
+            failed (list): Tenders already rejected upstream (optional)
+        
+        Returns:
+            dict: Results with counts of successful and failed events
+        """
+        successful = []
+        failed = list(failed or [])
+        create_event = self.create_event
+        
+        for tender in tenders:
+            try:
+                # Validate tender data
+                if not self._validate_tender(tender):
+                    failed.append({
+                        'tender': tender.get('tender_name', ''),
+                        'reason': 'Invalid data format'
+                    })
+                    continue
+                
+                # Parse bidding date
+                bidding_date = self._parse_date(tender['bidding_date'])
+                if not bidding_date:
+                    failed.append({
+                        'tender': tender['tender_name'],
+                        'reason': f"Invalid date format: {tender['bidding_date']}"
+                    })
+                    continue
+                
+                # Create an all-day calendar event on the bidding date
+                result = create_event(
+                    summary=f"Tender: {tender['tender_name']}",
+                    start_time=bidding_date.replace(hour=0, minute=0, second=0, microsecond=0),
+                    end_time=bidding_date.replace(hour=23, minute=59, second=0, microsecond=0),
+                    description=f"Bidding deadline for {tender['tender_name']}. Contact: {tender['email']}"
+                )
+                
+                if result and result.get('success'):
+                    successful.append({
+                        'tender': tender['tender_name'],
+                        'date': bidding_date.strftime('%Y-%m-%d')
+                    })
+                else:
+                    failed.append({
+                        'tender': tender['tender_name'],
+                        'reason': (result or {}).get('error', 'Failed to create calendar event')
+                    })
+            
+            except Exception as e:
+                logger.error(f"Error creating event for tender {tender.get('tender_name')}: {str(e)}")
+                failed.append({
+                    'tender': tender.get('tender_name', ''),
+                    'reason': str(e)
+                })
+        
+        # Send results to user
+        self._send_processing_results(successful, failed, sender_id)
+        
+        return {
+            'successful': len(successful),
+            'failed': len(failed)
+        }
+    
+    def _validate_tender(self, tender):
+        """Validate tender data format"""
+        return all(field in tender and tender[field] for field in REQUIRED_FIELDS)
+    
+    def _parse_date(self, date_string, dayfirst=True):
+        """Parse date string into datetime object, or None if it can't be parsed"""
+        # Already parsed upstream (e.g. by TenderService.process_tender_file)
+        if isinstance(date_string, datetime):
+            return date_string
+        
+        match = _DATE_RE.match(str(date_string))
+        if not match:
+            # Less common layouts such as '15 May 2023'
+            try:
+                return parse_date(str(date_string))
+            except ValueError:
+                return None
+        
+        iso_year, iso_month, iso_day, first, _, second, year = match.groups()
+        if iso_year:
+            candidates = [(iso_year, iso_month, iso_day)]
+        elif dayfirst:
+            candidates = [(year, second, first), (year, first, second)]
+        else:
+            candidates = [(year, first, second), (year, second, first)]
+        
+        # Only out-of-range values (e.g. 31/02) reach the except branch
+        for year, month, day in candidates:
+            try:
+                return datetime(int(year), int(month), int(day))
+            except ValueError:
+                continue
+        
+        return None
+    
+    def _send_processing_results(self, successful, failed, sender_id):
+        """
+        Send processing results to the user.
+        
+        Args:
+            successful (list): List of successfully processed tenders
+            failed (list): List of failed tenders
+            sender_id (str): Sender's phone number
+        """
+        parts = ["✅ Processed your tender file.\n\n"]
+        
+        if successful:
+            parts.append(f"Successfully created {len(successful)} reminder(s):\n")
+            # Show up to 5 examples
+            parts.extend(
+                f"{i}. {item['tender']} (Due: {item['date']})\n"
+                for i, item in enumerate(successful[:5], 1)
+            )
+            
+            if len(successful) > 5:
+                parts.append(f"...and {len(successful) - 5} more\n")
+        
+        if failed:
+            parts.append(f"\n❌ Failed to process {len(failed)} item(s):\n")
+            # Show up to 3 examples
+            parts.extend(
+                f"{i}. {item['tender']}: {item['reason']}\n"
+                for i, item in enumerate(failed[:3], 1)
+            )
+            
+            if len(failed) > 3:
+                parts.append(f"...and {len(failed) - 3} more\n")
+        
+        # Send the message
+        send_whatsapp_message(sender_id, "".join(parts))
@@ -2,15 +2,97 @@
 Utilities for parsing CSV and Excel files for the tender management system.
 """
 import csv
+import codecs
+import hashlib
+from functools import lru_cache
+import charset_normalizer
+import openpyxl
 import pandas as pd
 from datetime import datetime
 import os
 import logging
 
+from dateutil import parser as dateutil_parser
+
+from app.utils.ttl_cache import TTLCache
+
+# ciso8601 parses ISO 8601 in C; datetime.fromisoformat is the fallback
+try:
+    import ciso8601
+    _parse_iso = ciso8601.parse_datetime
+except ImportError:
+    _parse_iso = datetime.fromisoformat
+
+# python-calamine parses xlsx/xls in Rust; openpyxl via pandas is the fallback
+try:
+    from python_calamine import CalamineWorkbook
+    CALAMINE_SUPPORTED = True
+except ImportError:
+    CALAMINE_SUPPORTED = False
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Bytes read from the start of a CSV file to detect its encoding and dialect
+SNIFF_BYTES = 64 * 1024
+
+# Tried in order when a byte past the sniffed prefix doesn't fit the detected
+# encoding; latin-1 decodes any byte, so the last attempt always succeeds
+FALLBACK_ENCODINGS = ('cp1252', 'latin-1')
+
+# Chunk size for checking that a whole CSV file decodes before streaming it
+ENCODING_CHECK_BYTES = 1024 * 1024
+
+# Supported date formats, in the order they are tried
+DATE_FORMATS = [
+    '%Y-%m-%d',       # 2023-05-15
+    '%d/%m/%Y',       # 15/05/2023
+    '%m/%d/%Y',       # 05/15/2023
+    '%d-%m-%Y',       # 15-05-2023
+    '%m-%d-%Y',       # 05-15-2023
+    '%d.%m.%Y',       # 15.05.2023
+    '%m.%d.%Y',       # 05.15.2023
+    '%d %b %Y',       # 15 May 2023
+    '%d %B %Y',       # 15 May 2023
+    '%b %d, %Y',      # May 15, 2023
+    '%B %d, %Y',      # May 15, 2023
+]
+
+# Day-first and month-first formats for each numeric date separator
+_NUMERIC_DATE_FORMATS = {
+    '/': ('%d/%m/%Y', '%m/%d/%Y'),
+    '-': ('%d-%m-%Y', '%m-%d-%Y'),
+    '.': ('%d.%m.%Y', '%m.%d.%Y'),
+}
+
+# Accepted column names for each required field, most preferred first
+REQUIRED_FIELDS = {
+    'tender_name': ['tender_name', 'tender', 'name', 'project', 'project_name'],
+    'email': ['email', 'email_id', 'contact_email', 'contact'],
+    'bidding_date': ['bidding_date', 'date', 'due_date', 'deadline', 'submission_date']
+}
+
+# Column name -> (required field, preference rank)
+_ALIAS_TO_FIELD = {
+    alias: (req_field, rank)
+    for req_field, aliases in REQUIRED_FIELDS.items()
+    for rank, alias in enumerate(aliases)
+}
+
+# Without calamine, xlsx files larger than this are streamed with openpyxl
+# read_only mode instead of pd.read_excel
+EXCEL_STREAM_BYTES = 20 * 1024 * 1024
+
+# Reused for free-form dates that match none of DATE_FORMATS
+_DATEUTIL_PARSER = dateutil_parser.parser()
+
+# LRU of (delimiter, quotechar) keyed by a hash of the CSV header line; the
+# encoding is detected for every file since files sharing a header needn't
+# share one
+DIALECT_CACHE_SIZE = 64
+_dialect_cache = TTLCache(DIALECT_CACHE_SIZE, float('inf'))
+
 def parse_csv(file_path):
     """
     Parse a CSV file containing tender information.
@@ -25,84 +107,33 @@ def parse_csv(file_path):
         ValueError: If the file is invalid or missing required columns
     """
     logger.info(f"Parsing CSV file: {file_path}")
-    tenders = []
     
     try:
-        # Try different encodings if necessary
-        encodings = ['utf-8', 'utf-8-sig', 'latin-1', 'cp1252']
+        # Check if file is empty
+        if os.path.getsize(file_path) == 0:
+            raise ValueError("CSV file is empty")
+        
+        with open(file_path, 'rb') as rawfile:
+            head = rawfile.read(SNIFF_BYTES)
         
-        for encoding in encodings:
+        # Detect the encoding once from a prefix of the file
+        encoding = _detect_encoding(head)
+        
+        # Files sharing a header line usually share a dialect, so try the
+        # last one that worked before sniffing again
+        signature = _header_signature(head)
+        tenders = None
+        cached = _dialect_cache.get(signature)
+        if cached:
             try:
-                with open(file_path, 'r', encoding=encoding) as csvfile:
-                    # Check if file is empty
-                    if os.path.getsize(file_path) == 0:
-                        raise ValueError("CSV file is empty")
-                    
-                    # Peek at the first line to get column names
-                    first_line = csvfile.readline().strip()
-                    csvfile.seek(0)  # Reset file pointer
-                    
-                    # Try to detect delimiter
-                    sniffer = csv.Sniffer()
-                    dialect = sniffer.sniff(first_line)
-                    delimiter = dialect.delimiter
-                    
-                    reader = csv.DictReader(csvfile, delimiter=delimiter)
-                    
-                    # Check for required columns (case-insensitive)
-                    fieldnames_lower = [f.lower() for f in reader.fieldnames]
-                    required_fields = {
-                        'tender_name': ['tender_name', 'tender', 'name', 'project', 'project_name'],
-                        'email': ['email', 'email_id', 'contact_email', 'contact'],
-                        'bidding_date': ['bidding_date', 'date', 'due_date', 'deadline', 'submission_date']
-                    }
-                    
-                    field_mapping = {}
-                    for req_field, alternatives in required_fields.items():
-                        found = False
-                        for alt in alternatives:
-                            if alt.lower() in fieldnames_lower:
-                                field_mapping[req_field] = reader.fieldnames[fieldnames_lower.index(alt.lower())]
-                                found = True
-                                break
-                        
-                        if not found:
-                            raise ValueError(f"Missing required column: {req_field} (or equivalent)")
-                    
-                    # Process rows
-                    for row in reader:
-                        # Skip empty rows
-                        if not any(row.values()):
-                            continue
-                            
-                        tender = {
-                            'tender_name': row[field_mapping['tender_name']].strip(),
-                            'email': row[field_mapping['email']].strip(),
-                            'bidding_date': row[field_mapping['bidding_date']].strip()
-                        }
-                        
-                        # Validate tender_name is not empty
-                        if not tender['tender_name']:
-                            continue
-                            
-                        # Try to validate date format
-                        try:
-                            _ = parse_date(tender['bidding_date'])
-                            tenders.append(tender)
-                        except ValueError:
-                            logger.warning(f"Invalid date format in row: {tender}")
-                
-                # If we get here, parsing was successful
-                break
-                
-            except Exception as e:
-                # Try the next encoding if this one failed
-                if encoding == encodings[-1]:
-                    # This was the last encoding, re-raise the exception
-                    logger.error(f"Failed to parse CSV with all encodings: {str(e)}")
-                    raise
-                    
-                logger.warning(f"Failed with encoding {encoding}, trying next one")
+                tenders = _read_csv(file_path, encoding, _cached_dialect(*cached))
+            except (ValueError, csv.Error) as e:
+                logger.info(f"Cached CSV dialect did not fit, sniffing again: {e}")
+        
+        if tenders is None:
+            dialect = _sniff_dialect(head.decode(encoding, errors='replace'))
+            tenders = _read_csv(file_path, encoding, dialect)
+            _dialect_cache.set(signature, (dialect.delimiter, dialect.quotechar))
     
     except Exception as e:
         logger.error(f"Error parsing CSV file: {str(e)}")
@@ -111,78 +142,309 @@ def parse_csv(file_path):
     logger.info(f"Successfully parsed {len(tenders)} tenders from CSV")
     return tenders
 
-def parse_excel(file_path):
+def _read_csv(file_path, encoding, dialect):
     """
-    Parse an Excel file containing tender information.
+    Read tender rows, retrying with FALLBACK_ENCODINGS if decoding fails.
+    
+    The encoding is detected from a prefix only, so a later byte may not
+    fit it; the file is then read again rather than decoded with
+    replacement characters.
     
     Args:
-        file_path (str): Path to the Excel file
+        file_path (str): Path to the CSV file
+        encoding (str): Detected text encoding of the file
+        dialect: csv dialect to read the file with
+        
+    Returns:
+        list: List of dictionaries with tender information
+    """
+    candidates = _candidate_encodings(encoding)
+    for candidate in candidates[:-1]:
+        try:
+            return _read_csv_decoded(file_path, candidate, dialect)
+        except UnicodeDecodeError as e:
+            logger.info(f"CSV file is not valid {candidate}, trying the next encoding: {e}")
+    return _read_csv_decoded(file_path, candidates[-1], dialect)
+
+def _read_csv_decoded(file_path, encoding, dialect):
+    """
+    Read tender rows with pandas' C parser, falling back to the csv module.
+    
+    Args:
+        file_path (str): Path to the CSV file
+        encoding (str): Text encoding of the file
+        dialect: csv dialect to read the file with
         
     Returns:
         list: List of dictionaries with tender information
         
     Raises:
-        ValueError: If the file is invalid or missing required columns
+        UnicodeDecodeError: If the file is not valid in the given encoding
     """
-    logger.info(f"Parsing Excel file: {file_path}")
     try:
-        # Try to read the file with pandas
-        df = pd.read_excel(file_path, engine='openpyxl')
+        return _read_csv_frame(file_path, encoding, dialect)
+    except UnicodeDecodeError:
+        # The csv module would fail on the same bytes
+        raise
+    except Exception as e:
+        # Ragged rows and other input the C parser rejects still read fine
+        # row by row
+        logger.info(f"Falling back to csv module for {file_path}: {e}")
+        return _read_csv_tenders(file_path, encoding, dialect)
+
+def _read_csv_frame(file_path, encoding, dialect):
+    """
+    Read tender rows from a CSV file into a DataFrame and validate them.
+    
+    Args:
+        file_path (str): Path to the CSV file
+        encoding (str): Text encoding of the file
+        dialect: csv dialect to read the file with
+        
+    Returns:
+        list: List of dictionaries with tender information
+        
+    Raises:
+        ValueError: If the file is empty or missing required columns
+    """
+    read_options = {
+        'encoding': encoding,
+        'dialect': dialect,
+        'dtype': str,
+        'keep_default_na': False,
+        'na_filter': False,
+        'engine': 'c',
+    }
+    
+    # Read just the header to find the columns we need
+    header = pd.read_csv(file_path, nrows=0, **read_options).columns
+    indices = _map_required_columns([str(col).strip().lower() for col in header])
+    
+    fields = ['tender_name', 'email', 'bidding_date']
+    wanted = sorted(set(indices.values()))
+    df = pd.read_csv(file_path, usecols=wanted, **read_options)
+    
+    # usecols keeps file order, so label columns by position before picking fields
+    df.columns = wanted
+    sub = df[[indices[field] for field in fields]]
+    sub.columns = fields
+    
+    # Short rows come back as NaN even with na_filter off
+    return _tender_records(sub.fillna(''))
+
+def iter_csv(file_path):
+    """
+    Yield valid tenders from a CSV file one row at a time.
+    
+    Unlike parse_csv this never holds the whole file in memory, for uploads
+    too large to load at once.
+    
+    Args:
+        file_path (str): Path to the CSV file
+        
+    Yields:
+        dict: Tender information for each valid row
+        
+    Raises:
+        ValueError: If the file is empty or missing required columns
+    """
+    if os.path.getsize(file_path) == 0:
+        raise ValueError("CSV file is empty")
+    
+    with open(file_path, 'rb') as rawfile:
+        head = rawfile.read(SNIFF_BYTES)
+    
+    # Rows may already be consumed when a cached dialect turns out wrong,
+    # so unlike parse_csv there is no second attempt
+    encoding = _detect_encoding(head)
+    cached = _dialect_cache.get(_header_signature(head))
+    if cached:
+        dialect = _cached_dialect(*cached)
+    else:
+        dialect = _sniff_dialect(head.decode(encoding, errors='replace'))
+    
+    # Rows already yielded can't be re-read, so check the whole file decodes
+    # before streaming instead of retrying on failure like parse_csv
+    encoding = _decodable_encoding(file_path, encoding)
+    yield from _iter_csv_rows(file_path, encoding, dialect)
+
+def _read_csv_tenders(file_path, encoding, dialect):
+    """
+    Read tender rows from a CSV file with a known encoding and dialect.
+    
+    Args:
+        file_path (str): Path to the CSV file
+        encoding (str): Text encoding of the file
+        dialect: csv dialect to read the file with
+        
+    Returns:
+        list: List of dictionaries with tender information
+        
+    Raises:
+        ValueError: If the file is empty or missing required columns
+    """
+    return list(_iter_csv_rows(file_path, encoding, dialect))
+
+def _iter_csv_rows(file_path, encoding, dialect):
+    """
+    Yield valid tender rows from a CSV file with a known encoding and dialect.
+    
+    Args:
+        file_path (str): Path to the CSV file
+        encoding (str): Text encoding of the file
+        dialect: csv dialect to read the file with
+        
+    Yields:
+        dict: Tender information for each valid row
+        
+    Raises:
+        ValueError: If the file is empty or missing required columns
+    """
+    with open(file_path, 'r', encoding=encoding, newline='') as csvfile:
+        reader = csv.reader(csvfile, dialect)
+        fieldnames = next(reader, None)
+        if not fieldnames:
+            raise ValueError("CSV file is empty")
         
-        if df.empty:
-            raise ValueError("Excel file is empty or has no data")
-            
         # Check for required columns (case-insensitive)
-        columns_lower = [col.lower() if isinstance(col, str) else str(col).lower() for col in df.columns]
-        required_fields = {
-            'tender_name': ['tender_name', 'tender', 'name', 'project', 'project_name'],
-            'email': ['email', 'email_id', 'contact_email', 'contact'],
-            'bidding_date': ['bidding_date', 'date', 'due_date', 'deadline', 'submission_date']
-        }
-        
-        field_mapping = {}
-        for req_field, alternatives in required_fields.items():
-            found = False
-            for alt in alternatives:
-                if alt.lower() in columns_lower:
-                    field_mapping[req_field] = df.columns[columns_lower.index(alt.lower())]
-                    found = True
-                    break
+        field_mapping = _map_required_columns([f.strip().lower() for f in fieldnames])
+        
+        name_i = field_mapping['tender_name']
+        email_i = field_mapping['email']
+        date_i = field_mapping['bidding_date']
+        min_width = max(name_i, email_i, date_i) + 1
+        
+        # Process rows
+        for row in reader:
+            # Pad short rows so missing trailing cells read as empty
+            if len(row) < min_width:
+                row.extend([''] * (min_width - len(row)))
             
-            if not found:
-                raise ValueError(f"Missing required column: {req_field} (or equivalent)")
-        
-        # Process rows and convert to list of dictionaries
-        tenders = []
-        for _, row in df.iterrows():
-            # Skip rows where all mapped fields are empty/NaN
-            if all(pd.isna(row[field_mapping[field]]) for field in field_mapping):
+            # Skip rows whose required cells are all empty; other columns
+            # don't matter
+            if not (row[name_i] or row[email_i] or row[date_i]):
                 continue
                 
-            tender = {}
-            for req_field, excel_field in field_mapping.items():
-                value = row[excel_field]
-                
-                # Convert to string and strip whitespace
-                if pd.isna(value):
-                    value = ""
-                elif isinstance(value, (int, float)):
-                    value = str(value)
-                else:
-                    value = str(value).strip()
-                    
-                tender[req_field] = value
+            tender = {
+                'tender_name': row[name_i].strip(),
+                'email': row[email_i].strip(),
+                'bidding_date': row[date_i].strip()
+            }
             
             # Validate tender_name is not empty
             if not tender['tender_name']:
                 continue
                 
             # Try to validate date format
-            try:
-                _ = parse_date(tender['bidding_date'])
-                tenders.append(tender)
-            except ValueError:
+            if _parse_date_cached(tender['bidding_date']) is not None:
+                yield tender
+            else:
                 logger.warning(f"Invalid date format in row: {tender}")
+
+def _header_signature(head):
+    """Return a short hash of a CSV file's header line (at most 256 bytes)."""
+    header = head.split(b'\n', 1)[0][:256]
+    return hashlib.blake2b(header, digest_size=8).digest()
+
+def _detect_encoding(head):
+    """
+    Detect the text encoding of a file from its first bytes.
+    
+    Args:
+        head (bytes): Prefix of the file
+        
+    Returns:
+        str: Encoding name usable with open()
+    """
+    if head.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    
+    match = charset_normalizer.from_bytes(head).best()
+    if not match or match.encoding == 'ascii':
+        # ASCII prefixes are read as UTF-8 in case later rows aren't ASCII
+        return 'utf-8'
+    return match.encoding
+
+def _cached_dialect(delimiter, quotechar):
+    """Return a csv dialect with a cached delimiter and quotechar."""
+    return type('CachedDialect', (csv.excel,), {'delimiter': delimiter, 'quotechar': quotechar})
+
+def _candidate_encodings(encoding):
+    """Return the detected encoding followed by the FALLBACK_ENCODINGS not already tried."""
+    candidates = [encoding]
+    tried = {codecs.lookup(encoding).name}
+    for fallback in FALLBACK_ENCODINGS:
+        name = codecs.lookup(fallback).name
+        if name not in tried:
+            candidates.append(fallback)
+            tried.add(name)
+    return candidates
+
+def _decodable_encoding(file_path, encoding):
+    """
+    Return the first candidate encoding that strictly decodes the whole file.
+    
+    Args:
+        file_path (str): Path to the CSV file
+        encoding (str): Detected text encoding of the file
+        
+    Returns:
+        str: Encoding name usable with open()
+    """
+    candidates = _candidate_encodings(encoding)
+    for candidate in candidates[:-1]:
+        decoder = codecs.getincrementaldecoder(candidate)()
+        try:
+            with open(file_path, 'rb') as rawfile:
+                for chunk in iter(lambda: rawfile.read(ENCODING_CHECK_BYTES), b''):
+                    decoder.decode(chunk)
+                decoder.decode(b'', final=True)
+            return candidate
+        except UnicodeDecodeError as e:
+            logger.info(f"CSV file is not valid {candidate}, trying the next encoding: {e}")
+    return candidates[-1]
+
+def _sniff_dialect(sample):
+    """
+    Detect the CSV dialect from a decoded sample of the file.
+    
+    Args:
+        sample (str): Decoded prefix of the file
+        
+    Returns:
+        csv.Dialect: Detected dialect, or csv.excel if detection fails
+    """
+    # Drop a trailing partial line so it doesn't skew the delimiter count
+    last_newline = sample.rfind('\n')
+    if last_newline > 0:
+        sample = sample[:last_newline]
+    
+    try:
+        return csv.Sniffer().sniff(sample)
+    except csv.Error:
+        return csv.excel
+
+def parse_excel(file_path):
+    """
+    Parse an Excel file containing tender information.
+    
+    Args:
+        file_path (str): Path to the Excel file
+        
+    Returns:
+        list: List of dictionaries with tender information
+        
+    Raises:
+        ValueError: If the file is invalid or missing required columns
+    """
+    logger.info(f"Parsing Excel file: {file_path}")
+    try:
+        if not CALAMINE_SUPPORTED and os.path.getsize(file_path) > EXCEL_STREAM_BYTES:
+            # Stream large sheets row by row instead of loading the whole
+            # workbook into a DataFrame
+            tenders = list(_iter_excel_rows(file_path))
+        else:
+            tenders = _read_excel_tenders(file_path)
     
     except Exception as e:
         logger.error(f"Error parsing Excel file: {str(e)}")
@@ -191,6 +453,214 @@ def parse_excel(file_path):
     logger.info(f"Successfully parsed {len(tenders)} tenders from Excel")
     return tenders
 
+def _read_excel_tenders(file_path):
+    """
+    Read and validate tender rows from an Excel file via a DataFrame.
+    
+    Args:
+        file_path (str): Path to the Excel file
+        
+    Returns:
+        list: List of dictionaries with tender information
+        
+    Raises:
+        ValueError: If the file is empty or missing required columns
+    """
+    df = _read_excel_frame(file_path)
+    
+    if df.empty:
+        raise ValueError("Excel file is empty or has no data")
+        
+    # Check for required columns (case-insensitive)
+    columns_lower = [col.lower() if isinstance(col, str) else str(col).lower() for col in df.columns]
+    indices = _map_required_columns(columns_lower)
+    
+    # Work on the mapped columns as a whole instead of row by row
+    fields = ['tender_name', 'email', 'bidding_date']
+    sub = df[[df.columns[indices[field]] for field in fields]].copy()
+    sub.columns = fields
+    
+    # Skip rows where all mapped fields are empty/NaN
+    sub = sub[sub.notna().any(axis=1)]
+    
+    # Convert to string
+    for field in fields:
+        sub[field] = _excel_strings(sub[field])
+    
+    return _tender_records(sub)
+
+def _excel_strings(column):
+    """
+    Convert an Excel column to strings, with empty cells as ''.
+    
+    Calamine returns every number as a float, and pandas stores an int column
+    with gaps as floats, so whole numbers are written like openpyxl's ints:
+    '123' rather than '123.0'.
+    
+    Args:
+        column (Series): Column as read from the sheet
+        
+    Returns:
+        Series: The column as strings
+    """
+    strings = column.where(column.notna(), '').astype(str)
+    
+    if pd.api.types.is_float_dtype(column):
+        numbers = column
+    elif column.dtype == object:
+        # Only real float cells; numeric-looking text keeps its spelling
+        numbers = pd.to_numeric(column.where(column.map(type).eq(float)), errors='coerce')
+    else:
+        return strings
+    
+    whole = (numbers % 1 == 0) & (numbers.abs() < 2 ** 63)
+    if whole.any():
+        strings[whole] = numbers[whole].astype('int64').astype(str)
+    return strings
+
+def _iter_excel_rows(file_path):
+    """
+    Yield valid tender rows from the first sheet of an xlsx file.
+    
+    openpyxl's read_only mode streams rows from the file instead of building
+    the whole workbook, and values_only skips creating Cell objects.
+    
+    Args:
+        file_path (str): Path to the xlsx file
+        
+    Yields:
+        dict: Tender information for each valid row
+        
+    Raises:
+        ValueError: If the file is empty or missing required columns
+    """
+    workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if not header:
+            raise ValueError("Excel file is empty or has no data")
+        
+        # Check for required columns (case-insensitive)
+        indices = _map_required_columns([str(col).lower() for col in header])
+        
+        fields = ['tender_name', 'email', 'bidding_date']
+        positions = [indices[field] for field in fields]
+        has_data = False
+        
+        for row in rows:
+            has_data = True
+            
+            # Rows in read_only mode can be shorter than the header
+            values = [row[i] if i < len(row) else None for i in positions]
+            
+            # Skip rows where all mapped fields are empty
+            if all(value is None for value in values):
+                continue
+            
+            tender = {
+                field: '' if value is None else str(value).strip()
+                for field, value in zip(fields, values)
+            }
+            
+            # Validate tender_name is not empty
+            if not tender['tender_name']:
+                continue
+            
+            # Try to validate date format
+            if _parse_date_cached(tender['bidding_date']) is not None:
+                yield tender
+            else:
+                logger.warning(f"Invalid date format in row: {tender}")
+        
+        if not has_data:
+            raise ValueError("Excel file is empty or has no data")
+    finally:
+        workbook.close()
+
+def _read_excel_frame(file_path):
+    """
+    Read the first sheet of an Excel file into a DataFrame.
+    
+    Args:
+        file_path (str): Path to the Excel file
+        
+    Returns:
+        DataFrame: Sheet contents with the first row as column names
+    """
+    if not CALAMINE_SUPPORTED:
+        return pd.read_excel(file_path, engine='openpyxl')
+    
+    rows = CalamineWorkbook.from_path(file_path).get_sheet_by_index(0).to_python(skip_empty_area=True)
+    if not rows:
+        return pd.DataFrame()
+    
+    # Calamine returns empty cells as '', pandas readers return NaN
+    return pd.DataFrame(rows[1:], columns=rows[0]).replace('', float('nan'))
+
+def _is_valid_date(value):
+    """Return True if parse_date accepts the (already stripped) value."""
+    return _parse_date_cached(value) is not None
+
+def _map_required_columns(columns_lower):
+    """
+    Find the column holding each required field.
+    
+    Args:
+        columns_lower (list): Lowercased, stripped column names in file order
+        
+    Returns:
+        dict: Required field name -> column index
+        
+    Raises:
+        ValueError: If a required field has no matching column
+    """
+    field_mapping = {}
+    preference = {}
+    for index, column in enumerate(columns_lower):
+        match = _ALIAS_TO_FIELD.get(column)
+        if match is None:
+            continue
+        
+        # Earlier aliases win, as do earlier columns for the same alias
+        req_field, rank = match
+        if req_field not in preference or rank < preference[req_field]:
+            preference[req_field] = rank
+            field_mapping[req_field] = index
+    
+    for req_field in REQUIRED_FIELDS:
+        if req_field not in field_mapping:
+            raise ValueError(f"Missing required column: {req_field} (or equivalent)")
+    
+    return field_mapping
+
+def _tender_records(sub):
+    """
+    Strip and validate tender rows held in a DataFrame of strings.
+    
+    Args:
+        sub (DataFrame): tender_name, email and bidding_date string columns
+        
+    Returns:
+        list: List of dictionaries for rows with a name and a valid date
+    """
+    # Strip whitespace
+    for field in sub.columns:
+        sub[field] = sub[field].str.strip()
+    
+    # Validate tender_name is not empty
+    sub = sub[sub['tender_name'] != '']
+    
+    # Validate each distinct date once, however many rows share it
+    date_ok = {value: _is_valid_date(value) for value in sub['bidding_date'].unique()}
+    valid_mask = sub['bidding_date'].map(date_ok).astype(bool)
+    
+    for tender in sub[~valid_mask].to_dict('records'):
+        logger.warning(f"Invalid date format in row: {tender}")
+    
+    # Convert to list of dictionaries
+    return sub[valid_mask].to_dict('records')
+
 def parse_date(date_string):
     """
     Parse date string into datetime object.
@@ -204,37 +674,98 @@ def parse_date(date_string):
     Raises:
         ValueError: If the date string cannot be parsed
     """
+    # If the date is a pandas Timestamp or datetime object
+    if isinstance(date_string, (pd.Timestamp, datetime)):
+        return date_string
+    
     # Remove extra whitespace
     date_string = date_string.strip()
     
-    # Try common date formats
-    date_formats = [
-        '%Y-%m-%d',       # 2023-05-15
-        '%d/%m/%Y',       # 15/05/2023
-        '%m/%d/%Y',       # 05/15/2023
-        '%d-%m-%Y',       # 15-05-2023
-        '%m-%d-%Y',       # 05-15-2023
-        '%d.%m.%Y',       # 15.05.2023
-        '%m.%d.%Y',       # 05.15.2023
-        '%d %b %Y',       # 15 May 2023
-        '%d %B %Y',       # 15 May 2023
-        '%b %d, %Y',      # May 15, 2023
-        '%B %d, %Y',      # May 15, 2023
-    ]
+    parsed = _parse_date_cached(date_string)
+    if parsed is None:
+        raise ValueError(f"Could not parse date: {date_string}")
+    return parsed
+
+@lru_cache(maxsize=4096)
+def _parse_date_cached(date_string):
+    """
+    Parse a stripped date string, memoized since tender files repeat dates.
     
-    # If the date is a pandas Timestamp or datetime object
-    if isinstance(date_string, (pd.Timestamp, datetime)):
-        return date_string
+    Args:
+        date_string (str): Stripped date string
+        
+    Returns:
+        datetime: Parsed datetime object, or None if it cannot be parsed
+    """
+    # ISO dates and datetimes (2023-05-15, 2023-05-15T10:00) have a
+    # dedicated fast parser
+    if len(date_string) >= 10 and date_string[4] == '-':
+        try:
+            return _parse_iso(date_string)
+        except ValueError:
+            pass
+    
+    # Try the one format the string's shape points to
+    fmt = _guess_date_format(date_string)
+    if fmt:
+        try:
+            return datetime.strptime(date_string, fmt)
+        except ValueError:
+            pass
     
-    # Try each format
-    for fmt in date_formats:
+    # Unusual shapes: try each format
+    for fmt in DATE_FORMATS:
         try:
             return datetime.strptime(date_string, fmt)
         except ValueError:
             continue
     
-    # If all formats fail, try pandas to_datetime as a fallback
+    # Free-form strings: dateutil's parser, without pandas' overhead
+    try:
+        return _DATEUTIL_PARSER.parse(date_string)
+    except (ValueError, OverflowError):
+        pass
+    
+    # If all else fails, try pandas to_datetime as a last resort
     try:
         return pd.to_datetime(date_string).to_pydatetime()
     except Exception:
-        raise ValueError(f"Could not parse date: {date_string}")
\ No newline at end of file
+        return None
+
+# Lets tests reset the memoized results
+parse_date.cache_clear = _parse_date_cached.cache_clear
+
+def _guess_date_format(date_string):
+    """
+    Pick the most likely DATE_FORMATS entry from the shape of a date string.
+    
+    Args:
+        date_string (str): Stripped date string
+        
+    Returns:
+        str: strptime format, or None if the shape isn't recognised
+    """
+    # May 15, 2023
+    if ',' in date_string:
+        month = date_string.split(' ', 1)[0]
+        return '%b %d, %Y' if len(month) == 3 else '%B %d, %Y'
+    
+    # 15/05/2023, 05/15/2023, 2023-05-15 and friends
+    for separator, (day_first, month_first) in _NUMERIC_DATE_FORMATS.items():
+        if separator in date_string:
+            parts = date_string.split(separator)
+            if len(parts) != 3:
+                return None
+            if separator == '-' and len(parts[0]) == 4:
+                return '%Y-%m-%d'
+            # Day first unless the middle part can't be a month
+            if parts[1].isdigit() and int(parts[1]) > 12:
+                return month_first
+            return day_first
+    
+    # 15 May 2023
+    parts = date_string.split()
+    if len(parts) == 3:
+        return '%d %b %Y' if len(parts[1]) == 3 else '%d %B %Y'
+    
+    return None
\ No newline at end of file
@@ -7,9 +7,37 @@ import pytz
 import re
 from app.config import TIME_ZONE
 
+# Resolved once; pytz looks the zone up on every timezone() call
+_TZ = pytz.timezone(TIME_ZONE)
+
+# Basic email address format
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
+# Provider names that let us complete a domain missing its '@' or '.'
+_PROVIDER_RE = re.compile(r'gmail|gamail|yahoo|hotmail')
+_PROVIDER_DOMAINS = {
+    'gmail': 'gmail.com',
+    'gamail': 'gmail.com',
+    'yahoo': 'yahoo.com',
+    'hotmail': 'hotmail.com',
+}
+
+# Common misspellings of provider names and their corrections
+_TYPO_RE = re.compile(r'gamail|gmaill|gmal|yahooo|hotmial')
+_TYPO_FIXES = {
+    'gamail': 'gmail',
+    'gmaill': 'gmail',
+    'gmal': 'gmail',
+    'yahooo': 'yahoo',
+    'hotmial': 'hotmail',
+}
+
+# Whitespace that follows the end of a sentence
+_SENTENCE_END_RE = re.compile(r'(?<=[.!?])\s+')
+
 def get_current_time():
     """Returns the current time in the configured timezone."""
-    return datetime.datetime.now(pytz.timezone(TIME_ZONE))
+    return datetime.datetime.now(_TZ)
 
 def format_datetime(dt, format_str="%Y-%m-%d %H:%M:%S"):
     """Formats a datetime object as a string."""
@@ -43,48 +71,33 @@ def is_valid_email(email):
         tuple: (is_valid, error_message, suggestion)
     """
     # Basic format check with regex
-    email_regex = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    is_valid = bool(re.match(email_regex, email))
-    
-    if is_valid:
+    if _EMAIL_RE.match(email):
         return True, None, None
     
     # Check for common errors and provide suggestions
     error_message = "Invalid email format."
     suggestion = None
+    username, at, domain = email.partition('@')
     
     # Check for missing @ symbol
-    if '@' not in email:
+    if not at:
         error_message = "Missing '@' symbol in email address."
         parts = email.split('.')
         if len(parts) >= 2:
             domain_part = parts[-2] if len(parts) > 2 else parts[0]
-            if 'gmail' in domain_part or 'gmaill' in domain_part or 'gamail' in domain_part:
-                username = email.split('.')[0] if '.' in email else email
-                suggestion = f"{username}@gmail.com"
-            elif 'yahoo' in domain_part:
-                username = email.split('.')[0] if '.' in email else email
-                suggestion = f"{username}@yahoo.com"
-            elif 'hotmail' in domain_part:
-                username = email.split('.')[0] if '.' in email else email
-                suggestion = f"{username}@hotmail.com"
+            provider = _PROVIDER_RE.search(domain_part)
+            if provider:
+                suggestion = f"{parts[0]}@{_PROVIDER_DOMAINS[provider.group()]}"
             else:
                 # Generic suggestion
-                username = parts[0]
-                domain = '.'.join(parts[1:])
-                suggestion = f"{username}@{domain}"
+                suggestion = f"{parts[0]}@{'.'.join(parts[1:])}"
     
     # Check for missing dot in domain
-    elif '.' not in email.split('@')[1]:
+    elif '.' not in domain:
         error_message = "Missing '.' in domain part of email."
-        username, domain = email.split('@')
-        
-        if 'gmail' in domain or 'gmaill' in domain or 'gamail' in domain:
-            suggestion = f"{username}@gmail.com"
-        elif 'yahoo' in domain:
-            suggestion = f"{username}@yahoo.com"
-        elif 'hotmail' in domain:
-            suggestion = f"{username}@hotmail.com"
+        provider = _PROVIDER_RE.search(domain)
+        if provider:
+            suggestion = f"{username}@{_PROVIDER_DOMAINS[provider.group()]}"
         else:
             suggestion = f"{username}@{domain}.com"
     
@@ -94,22 +107,14 @@ def is_valid_email(email):
         suggestion = email.replace(',', '.')
     
     # Check for common domain typos
-    elif '@' in email:
-        username, domain = email.split('@')
-        domain_parts = domain.split('.')
-        
-        if 'gamail' in domain_parts[0]:
-            error_message = "Did you mean 'gmail' instead of 'gamail'?"
-            domain_parts[0] = domain_parts[0].replace('gamail', 'gmail')
-            suggestion = f"{username}@{'.'.join(domain_parts)}"
-        elif 'gmaill' in domain_parts[0]:
-            error_message = "Did you mean 'gmail' instead of 'gmaill'?"
-            domain_parts[0] = domain_parts[0].replace('gmaill', 'gmail')
-            suggestion = f"{username}@{'.'.join(domain_parts)}"
-        elif 'gmal' in domain_parts[0]:
-            error_message = "Did you mean 'gmail' instead of 'gmal'?"
-            domain_parts[0] = domain_parts[0].replace('gmal', 'gmail')
-            suggestion = f"{username}@{'.'.join(domain_parts)}"
+    else:
+        label, dot, rest = domain.partition('.')
+        typo = _TYPO_RE.search(label)
+        if typo:
+            typo = typo.group()
+            fix = _TYPO_FIXES[typo]
+            error_message = f"Did you mean '{fix}' instead of '{typo}'?"
+            suggestion = f"{username}@{label.replace(typo, fix)}{dot}{rest}"
     
     return False, error_message, suggestion
 
@@ -132,16 +137,15 @@ def create_time_slot_range(start_time, end_time, duration_minutes=30):
     Returns:
         A list of (start, end) tuples for each time slot
     """
-    slots = []
-    slot_start = start_time
+    duration = datetime.timedelta(minutes=duration_minutes)
     
-    while slot_start < end_time:
-        slot_end = slot_start + datetime.timedelta(minutes=duration_minutes)
-        if slot_end <= end_time:
-            slots.append((slot_start, slot_end))
-        slot_start = slot_end
-        
-    return slots
+    # Number of whole slots that fit; a partial slot at the end is dropped
+    count = (end_time - start_time) // duration
+    
+    return [
+        (start_time + i * duration, start_time + (i + 1) * duration)
+        for i in range(count)
+    ]
 
 def get_weekday_name(date):
     """Returns the name of the weekday for a given date."""
@@ -164,14 +168,22 @@ def summarize_text(text, max_length=200):
     if len(text) <= max_length:
         return text
         
-    # Split into sentences
-    sentences = re.split(r'(?<=[.!?])\s+', text)
-    
-    summary = ""
-    for sentence in sentences:
-        if len(summary) + len(sentence) + 1 <= max_length:
-            summary += sentence + " "
-        else:
+    # Take sentences until the next one would overflow, without splitting
+    # the rest of the text
+    sentences = []
+    length = 0
+    for sentence in _iter_sentences(text):
+        length += len(sentence) + 1
+        if length > max_length:
             break
+        sentences.append(sentence)
             
-    return summary.strip()
\ No newline at end of file
+    return " ".join(sentences).strip()
+
+def _iter_sentences(text):
+    """Yields the sentences of text lazily, split after '.', '!' or '?'."""
+    start = 0
+    for match in _SENTENCE_END_RE.finditer(text):
+        yield text[start:match.start()]
+        start = match.end()
+    yield text[start:]
\ No newline at end of file
@@ -0,0 +1,21 @@
+"""
+Shared HTTP session for outbound downloads and Twilio API calls.
+"""
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# One pooled session per process, so media downloads and the Twilio client's
+# sends reuse the same TLS connections to Twilio instead of paying a fresh
+# handshake for every message
+session = requests.Session()
+session.mount('https://', HTTPAdapter(
+    pool_connections=20,
+    pool_maxsize=50,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=frozenset(['GET'])
+    )
+))
@@ -1,10 +1,44 @@
 """
 LLM utilities for intent recognition and entity extraction using OpenRouter API.
 """
+import copy
 import json
+from datetime import date
+from functools import lru_cache
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from app.config import OPENROUTER_API_KEY, OPENROUTER_URL
 
+# Intents the LLM may return; anything else maps to "unknown"
+INTENTS = frozenset([
+    "send_email",
+    "schedule_meeting",
+    "check_calendar",
+    "find_contact",
+    "check_free_slots",
+    "process_tenders"
+])
+
+# Distinct messages whose LLM results are kept in memory
+LLM_CACHE_SIZE = 512
+
+# (connect, read) timeouts so a stalled OpenRouter can't hang a webhook worker
+REQUEST_TIMEOUT = (3.05, 30)
+
+# Shared so every client reuses the same pooled TLS connections to OpenRouter
+_session = requests.Session()
+_session.mount('https://', HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=8,
+    max_retries=Retry(
+        total=2,
+        backoff_factor=0.2,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=frozenset(['POST'])
+    )
+))
+
 class OpenRouterClient:
     def __init__(self):
         """Initialize the OpenRouter client for LLM access."""
@@ -16,118 +50,134 @@ class OpenRouterClient:
         if not self.initialized:
             print("OpenRouter API key not found. LLM features will fall back to transformer models.")
     
-    def recognize_intent(self, message):
-        """Recognize intent using OpenRouter API."""
+    def classify_and_extract(self, message):
+        """
+        Recognize intent and extract entities with a single OpenRouter request.
+        
+        Results are cached per message, ignoring surrounding whitespace (and
+        per day, so relative dates stay current). Repeated messages and
+        calling recognize_intent then extract_entities on the same message
+        make one request.
+        
+        Args:
+            message: The user message
+        
+        Returns:
+            Dict with "intent" and "entities" keys, or None on failure
+        """
         if not self.initialized:
             return None
-            
+        
         try:
-            prompt = f"""Classify this message into exactly one of these intents:
-            - send_email: If the user wants to send an email
-            - schedule_meeting: If the user wants to schedule a meeting or appointment
-            - check_calendar: If the user wants to check events or see what's on their calendar like for today, tomorrow, etc.
-            - find_contact: If the user wants contact information like email, phone, etc.
-            - check_free_slots: If the user wants to know when they are available
-            - process_tenders: If the user wants to process tenders, upload tender files, or set tender reminders
-            
-            Message: "{message}"
-            
-            Return ONLY the intent, nothing else."""
-            
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
-            
-            payload = {
-                "model": self.model,
-                "messages": [{"role": "user", "content": prompt}],
-                "temperature": 0,
-                "max_tokens": 15
-            }
-            
-            response = requests.post(self.api_url, json=payload, headers=headers)
-            response.raise_for_status()
-            result = response.json()
-            
-            intent = result["choices"][0]["message"]["content"].strip().lower()
-            
-            # Map to our intent constants
-            intent_mapping = {
-                "send_email": "send_email",
-                "schedule_meeting": "schedule_meeting",
-                "check_calendar": "check_calendar", 
-                "find_contact": "find_contact",
-                "check_free_slots": "check_free_slots",
-                "process_tenders": "process_tenders"
-            }
-            
-            mapped_intent = intent_mapping.get(intent, "unknown")
-            return {"intent": mapped_intent, "confidence": 0.95}
-            
+            return _classify_and_extract(self.api_url, self.api_key, self.model, message.strip(), date.today())
+        except json.JSONDecodeError as e:
+            print(f"Error parsing JSON from OpenRouter: {e}")
+            return None
         except Exception as e:
-            print(f"Error in OpenRouter intent recognition: {e}")
+            print(f"Error in OpenRouter classification: {e}")
             return None
     
+    def clear_cache(self):
+        """Forget cached LLM results, for all clients."""
+        _classify_and_extract.cache_clear()
+    
+    def recognize_intent(self, message):
+        """Recognize intent using OpenRouter API."""
+        result = self.classify_and_extract(message)
+        if result is None:
+            return None
+        return {"intent": result["intent"], "confidence": 0.95}
+    
     def extract_entities(self, message, intent=None):
-        """Extract entities using OpenRouter API."""
-        if not self.initialized:
+        """
+        Extract entities using OpenRouter API.
+        
+        The intent hint is no longer sent: the combined request classifies
+        the message itself.
+        """
+        result = self.classify_and_extract(message)
+        if result is None:
             return None
-            
-        try:
-            # Build context based on intent
-            context = ""
-            if intent:
-                context = f"The user wants to {intent.replace('_', ' ')}. "
-            
-            prompt = f"""{context}Extract the following entities from this message in JSON format:
-            {{
-                "person": [], # List of people mentioned (names)
-                "date": null, # Date mentioned (in YYYY-MM-DD format)
-                "time": null, # Time mentioned (in HH:MM format)
-                "duration": null, # Duration in minutes (as a number)
-                "email": [], # List of email addresses
-                "subject": null, # Subject/topic mentioned
-                "body": null, # Body/content of a message
-                "location": null # Location mentioned
-            }}
-            
-            Message: "{message}"
-            
-            Return ONLY valid JSON, nothing else."""
-            
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
-            
-            payload = {
-                "model": self.model,
-                "messages": [{"role": "user", "content": prompt}],
-                "temperature": 0,
-                "max_tokens": 400
-            }
-            
-            response = requests.post(self.api_url, json=payload, headers=headers)
-            response.raise_for_status()
-            result = response.json()
-            
-            result_content = result["choices"][0]["message"]["content"].strip()
-            
-            # Clean up the response to ensure valid JSON
-            start_idx = result_content.find('{')
-            end_idx = result_content.rfind('}')
-            if start_idx >= 0 and end_idx >= 0:
-                result_content = result_content[start_idx:end_idx+1]
-            
-            try:
-                entities = json.loads(result_content)
-                return entities
-            except json.JSONDecodeError as e:
-                print(f"Error parsing JSON from OpenRouter: {e}")
-                print(f"Raw response: {result_content}")
-                return None
-            
-        except Exception as e:
-            print(f"Error in OpenRouter entity extraction: {e}")
-            return None
\ No newline at end of file
+        # Callers adjust the entities in place, so keep the cached copy intact
+        return copy.deepcopy(result["entities"])
+
+@lru_cache(maxsize=LLM_CACHE_SIZE)
+def _classify_and_extract(api_url, api_key, model, message, today):
+    """
+    Send the combined intent and entity prompt to OpenRouter.
+    
+    Args:
+        api_url: Chat completions endpoint
+        api_key: OpenRouter API key
+        model: Model name
+        message: The user message
+        today: Current date, only used as part of the cache key
+    
+    Returns:
+        Dict with "intent" and "entities" keys
+    
+    Raises:
+        Exception: On request or JSON errors, so failures are not cached
+    """
+    prompt = f"""Classify this message and extract its entities.
+    
+    The intent is exactly one of these:
+    - send_email: If the user wants to send an email
+    - schedule_meeting: If the user wants to schedule a meeting or appointment
+    - check_calendar: If the user wants to check events or see what's on their calendar like for today, tomorrow, etc.
+    - find_contact: If the user wants contact information like email, phone, etc.
+    - check_free_slots: If the user wants to know when they are available
+    - process_tenders: If the user wants to process tenders, upload tender files, or set tender reminders
+    
+    Return the result in this JSON format:
+    {{
+        "intent": "send_email", # One of the intents above
+        "entities": {{
+            "person": [], # List of people mentioned (names)
+            "date": null, # Date mentioned (in YYYY-MM-DD format)
+            "time": null, # Time mentioned (in HH:MM format)
+            "duration": null, # Duration in minutes (as a number)
+            "email": [], # List of email addresses
+            "subject": null, # Subject/topic mentioned
+            "body": null, # Body/content of a message
+            "location": null # Location mentioned
+        }}
+    }}
+    
+    Message: "{message}"
+    
+    Return ONLY valid JSON, nothing else."""
+    
+    headers = {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json"
+    }
+    
+    payload = {
+        "model": model,
+        "messages": [{"role": "user", "content": prompt}],
+        "temperature": 0,
+        "max_tokens": 500
+    }
+    
+    response = _session.post(api_url, json=payload, headers=headers, timeout=REQUEST_TIMEOUT)
+    response.raise_for_status()
+    result = response.json()
+    
+    result_content = result["choices"][0]["message"]["content"].strip()
+    
+    # Clean up the response to ensure valid JSON
+    start_idx = result_content.find('{')
+    end_idx = result_content.rfind('}')
+    if start_idx >= 0 and end_idx >= 0:
+        result_content = result_content[start_idx:end_idx+1]
+    
+    parsed = json.loads(result_content)
+    
+    # Map to our intent constants
+    intent = str(parsed.get("intent") or "").strip().lower()
+    entities = parsed.get("entities")
+    return {
+        "intent": intent if intent in INTENTS else "unknown",
+        "entities": entities if isinstance(entities, dict) else {}
+    }
\ No newline at end of file
@@ -0,0 +1,82 @@
+"""
+Small thread-safe LRU cache whose entries expire after a fixed time.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+class TTLCache:
+    def __init__(self, maxsize, ttl, sliding=False):
+        """
+        Initialize the cache.
+        
+        Args:
+            maxsize: Maximum number of entries; the least recently used is dropped
+                first. None leaves the size unbounded
+            ttl: Seconds an entry stays valid after it was stored
+            sliding: If True, reading an entry also restarts its ttl
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.sliding = sliding
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def __contains__(self, key):
+        """Return True if key has an unexpired entry, without counting as a read."""
+        with self._lock:
+            return self._live_entry(key) is not None
+    
+    def __len__(self):
+        with self._lock:
+            self._evict_expired()
+            return len(self._entries)
+    
+    def get(self, key, default=None):
+        """Return the cached value for key, or default if missing or expired."""
+        with self._lock:
+            entry = self._live_entry(key)
+            if entry is None:
+                return default
+            if self.sliding:
+                entry[0] = time.monotonic()
+            self._entries.move_to_end(key)
+            return entry[1]
+    
+    def set(self, key, value):
+        """Store value under key, evicting the least recently used entry if full."""
+        with self._lock:
+            self._entries[key] = [time.monotonic(), value]
+            self._entries.move_to_end(key)
+            self._evict_expired()
+            if self.maxsize is not None and len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def pop(self, key, default=None):
+        """Remove key and return its value, or default if missing or expired."""
+        with self._lock:
+            entry = self._live_entry(key)
+            self._entries.pop(key, None)
+            return default if entry is None else entry[1]
+    
+    def clear(self):
+        """Remove every entry."""
+        with self._lock:
+            self._entries.clear()
+    
+    def _live_entry(self, key):
+        """Return the [stored_at, value] entry for key, dropping it if expired (lock held)."""
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() - entry[0] > self.ttl:
+            del self._entries[key]
+            return None
+        return entry
+    
+    def _evict_expired(self):
+        """Drop expired entries from the least recently used end (lock held)."""
+        cutoff = time.monotonic() - self.ttl
+        while self._entries:
+            key, entry = next(iter(self._entries.items()))
+            if entry[0] >= cutoff:
+                break
+            del self._entries[key]
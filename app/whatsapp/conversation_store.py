@@ -0,0 +1,82 @@
+"""
+In-memory store for multi-step conversation state that forgets abandoned conversations.
+"""
+from app.config import CONVERSATION_TTL_SECONDS
+from app.utils.ttl_cache import TTLCache
+
+class ConversationStore(TTLCache):
+    def __init__(self, ttl=CONVERSATION_TTL_SECONDS):
+        """
+        Initialize the conversation store.
+        
+        Supports the dict operations the message handler uses (in, [], []=,
+        del, get, pop). An entry expires once it hasn't been read or written for
+        ttl seconds, so users who abandon a flow don't hold memory forever.
+        
+        Args:
+            ttl: Seconds of inactivity after which a conversation is dropped
+        """
+        # Reading counts as activity; handlers update the state in place
+        super().__init__(None, ttl, sliding=True)
+    
+    def __getitem__(self, from_number):
+        state = self.get(from_number)
+        if state is None:
+            raise KeyError(from_number)
+        return state
+    
+    def __setitem__(self, from_number, state):
+        self.set(from_number, state)
+    
+    def __delitem__(self, from_number):
+        # Deleting a conversation that already expired is not an error
+        self.pop(from_number)
+
+class ConversationState:
+    """
+    State of one user's multi-step conversation.
+    
+    Fields that haven't been collected yet are None. Slots keep each state
+    small and turn a misspelled field into an AttributeError instead of a
+    silently ignored dict key.
+    """
+    __slots__ = (
+        "type",
+        "step",
+        "recipient",
+        "subject",
+        "body",
+        "suggested_email",
+        "person",
+        "date",
+        "time",
+        "end_time",
+        "duration",
+        "location",
+        "description",
+        "alternative_slots"
+    )
+    
+    def __init__(self, type, step, **fields):
+        """
+        Initialize a conversation state.
+        
+        Args:
+            type: Conversation flow ('email', 'meeting' or 'tender')
+            step: Current step within the flow
+            **fields: Initial values for any other fields
+        """
+        for name in self.__slots__:
+            setattr(self, name, None)
+        self.type = type
+        self.step = step
+        for name, value in fields.items():
+            setattr(self, name, value)
+    
+    def __repr__(self):
+        fields = ", ".join(
+            f"{name}={getattr(self, name)!r}"
+            for name in self.__slots__
+            if getattr(self, name) is not None
+        )
+        return f"ConversationState({fields})"
@@ -1,12 +1,15 @@
 """
 Handler for WhatsApp messages with intent-based processing.
 """
+import re
+import html
 import datetime
-import traceback
+import logging
 import pytz
-import os
-import tempfile
-import requests
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout
+from functools import lru_cache
+from string import Template
+from time import sleep
 from app.config import TIME_ZONE
 
 from app.nlp.intent_recognizer import (
@@ -16,6 +19,7 @@ from app.nlp.intent_recognizer import (
     INTENT_CHECK_CALENDAR,
     INTENT_SEND_EMAIL,
     INTENT_FIND_CONTACT,
+    INTENT_CHECK_FREE_SLOTS,
     INTENT_UNKNOWN
 )
 from app.nlp.entity_extractor import EntityExtractor
@@ -24,11 +28,196 @@ from app.services.calendar_service import CalendarService
 from app.services.contacts_service import ContactsService
 from app.services.contacts_db_service import ContactsDBService
 from app.services.tender_service import TenderService
+from app.utils.ttl_cache import TTLCache
 from app.utils.helpers import format_date, format_time, get_current_time, is_valid_email
 from ..services.file_processor import FileProcessor
+from .conversation_store import ConversationStore, ConversationState
 from .twilio_client import send_whatsapp_message
 
+logger = logging.getLogger(__name__)
+
+# Seconds to wait for Google Contacts before settling for the local DB's match
+CONTACT_LOOKUP_TIMEOUT = 2.0
+
+# Resolved contacts are reused for this long, so one meeting or email flow
+# looks each name up once
+CONTACT_CACHE_TTL = 300
+CONTACT_CACHE_SIZE = 1024
+# Google lookups are also kept on disk, so they outlive restarts
+CONTACT_DISK_CACHE_TTL = 24 * 60 * 60
+
+# Runs the Google and local DB contact lookups side by side
+_contact_lookups = ThreadPoolExecutor(max_workers=8, thread_name_prefix="contact-lookup")
+
+# Follow-up I/O that the user's reply shouldn't wait for, e.g. invitation emails
+_background_io = ThreadPoolExecutor(max_workers=4, thread_name_prefix="background-io")
+
+# Invitation emails are retried with exponential backoff (2s, 4s, ...)
+MEETING_EMAIL_ATTEMPTS = 3
+MEETING_EMAIL_BACKOFF = 2.0
+
+# Resolved once; pytz.timezone() looks the zone up on every call
+_TZ = pytz.timezone(TIME_ZONE)
+
+# Replies accepted at each confirmation step, compared against the lowercased message
+_CONFIRM_EMAIL = frozenset(["yes", "y", "sure", "ok", "send"])
+_CONFIRM_CONTACT = frozenset(["yes", "y", "correct", "confirm", "right"])
+_CONFIRM_BOOKING = frozenset(["yes", "y", "sure", "ok", "book"])
+_DECLINE_BOOKING = frozenset(["no", "n", "nope", "cancel"])
+
+# Words that introduce a contact name in "find contact" requests
+_CONTACT_LEAD_WORDS = frozenset(["for", "about", "contact", "email", "address", "phone"])
+# First lead word, as a whole whitespace-separated word, followed by the name
+_CONTACT_LEAD_RE = re.compile(
+    r'(?<!\S)(?:' + '|'.join(sorted(_CONTACT_LEAD_WORDS)) + r')\s+(\S.*)',
+    re.IGNORECASE | re.DOTALL
+)
+
+# Intents whose handlers use extracted entities; the rest skip extraction
+_INTENTS_WITH_ENTITIES = frozenset([
+    INTENT_SEND_EMAIL,
+    INTENT_SCHEDULE_MEETING,
+    INTENT_CHECK_CALENDAR,
+    INTENT_FIND_CONTACT,
+    INTENT_CHECK_FREE_SLOTS
+])
+
+# Whole-message commands that map straight to an intent without the NLP models
+_KEYWORD_INTENTS = {
+    "process tenders": INTENT_PROCESS_TENDERS,
+    "process tender": INTENT_PROCESS_TENDERS,
+    "tenders": INTENT_PROCESS_TENDERS,
+    "send email": INTENT_SEND_EMAIL,
+    "send an email": INTENT_SEND_EMAIL,
+    "schedule meeting": INTENT_SCHEDULE_MEETING,
+    "schedule a meeting": INTENT_SCHEDULE_MEETING,
+    "check calendar": INTENT_CHECK_CALENDAR,
+    "check my calendar": INTENT_CHECK_CALENDAR,
+    "calendar": INTENT_CHECK_CALENDAR,
+    "find contact": INTENT_FIND_CONTACT,
+    "free slots": INTENT_CHECK_FREE_SLOTS,
+    "check availability": INTENT_CHECK_FREE_SLOTS,
+    "help": INTENT_UNKNOWN
+}
+
+# Reply templates shared by the conversation flows, formatted by _reply
+_RESPONSES = {
+    "email_canceled": "Email canceled.",
+    "meeting_canceled": "Meeting scheduling canceled.",
+    "ask_email_subject": "What's the subject of the email? (or type 'cancel' to abort)",
+    "ask_email_body": "What's the content of the email? (or type 'cancel' to abort)",
+    "email_failed": "Failed to send email: {error}",
+    "ask_meeting_date": "What date? (or type 'cancel' to abort)",
+    "ask_meeting_time": "What time on {date}? (or type 'cancel' to abort)",
+    "invalid_date": (
+        "I couldn't understand that date. Please provide a specific date "
+        "like 'tomorrow', 'next Friday', or 'May 15th'."
+    ),
+    "invalid_time": (
+        "I couldn't understand that time. Please provide a specific time "
+        "like '3pm', '15:30', or 'at 2 o'clock'."
+    ),
+    "invalid_time_format": "I couldn't process that time format. Please use HH:MM format (e.g. 13:00).",
+    "invalid_slot": (
+        "Invalid selection. Please choose a number from the list "
+        "or type 'cancel' to abort."
+    ),
+    "unclear_confirmation": (
+        "I didn't understand your response. Please answer with 'yes', 'no', "
+        "or the number of an alternative slot."
+    ),
+    "tender_upload": (
+        "Please upload a CSV or Excel file containing tender information with the following columns:\n"
+        "- tender_name\n"
+        "- email\n"
+        "- bidding_date"
+    ),
+    "unsupported_file": "❌ Please send a CSV or Excel file. Other file types are not supported."
+}
+
+# Invitation email sent to attendees once a meeting with a Meet link is booked;
+# values are HTML-escaped before substitution
+_MEETING_EMAIL_TEMPLATE = Template("""
+            <html>
+            <body>
+                <h2>Meeting Invitation</h2>
+                <p>You have been invited to a meeting.</p>
+                
+                <h3>Meeting Details:</h3>
+                <ul>
+                    <li><strong>Date:</strong> $date</li>
+                    <li><strong>Time:</strong> $start - $end</li>
+                    <li><strong>Google Meet:</strong> <a href="$meet_link">$meet_link</a></li>
+                </ul>
+                
+                <p>You can join the meeting by clicking the Google Meet link above.</p>
+                
+                $notes
+                
+                <p>This invitation was sent by $organizer.</p>
+            </body>
+            </html>
+            """)
+_MEETING_NOTES_TEMPLATE = Template("<h3>Notes:</h3><p>$description</p>")
+
+# The organizer named in invitations (the assistant's identity)
+_MEETING_ORGANIZER = "Your AI Personal Assistant"
+
+# Content types Twilio reports for the spreadsheet files accepted for tender processing
+_SPREADSHEET_MIME_TYPES = frozenset([
+    "text/csv",
+    "application/vnd.ms-excel",
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+])
+
+# Fallback for less common spellings, e.g. "application/csv" or "text/x-csv"
+_SPREADSHEET_MEDIA_RE = re.compile(r'\b(?:csv|spreadsheet|excel|xls)', re.IGNORECASE)
+
+def _is_spreadsheet(media_type):
+    """Return True if a media content type is a CSV or Excel file."""
+    return media_type in _SPREADSHEET_MIME_TYPES or bool(_SPREADSHEET_MEDIA_RE.search(media_type))
+
+def _format_event(idx, event):
+    """Return one numbered entry of the calendar listing, ending in a blank line."""
+    start_time = format_time(event['start'].time()) if isinstance(event['start'], datetime.datetime) else "All day"
+    end_time = format_time(event['end'].time()) if isinstance(event['end'], datetime.datetime) else ""
+    time_str = f"{start_time} - {end_time}" if end_time else start_time
+    
+    location = f"   📍 {event['location']}\n" if event.get('location') else ""
+    return f"{idx}. {time_str}\n   {event['summary']}\n{location}\n"
+
+def _format_contact_line(idx, contact):
+    """Return one numbered line of a contact search result."""
+    email = f" ({contact['email']})" if contact.get('email') else ""
+    phone = f" - {contact['phone']}" if contact.get('phone') else ""
+    return f"{idx}. {contact['name']}{email}{phone}\n"
+
+@lru_cache(maxsize=None)
+def _shared(service_class):
+    """
+    Return the process-wide instance of a model or service class.
+    
+    The NLP classes load transformer weights and the Google services build API
+    clients, so every handler reuses the first instance instead of loading
+    its own.
+    """
+    return service_class()
+
 class MessageHandler:
+    __slots__ = (
+        "whatsapp_client",
+        "intent_recognizer",
+        "entity_extractor",
+        "email_service",
+        "calendar_service",
+        "contacts_service",
+        "contacts_db_service",
+        "tender_service",
+        "file_processor",
+        "user_state",
+        "_contact_cache"
+    )
+    
     def __init__(self, whatsapp_client):
         """
         Initialize the message handler.
@@ -37,147 +226,68 @@ class MessageHandler:
             whatsapp_client: WhatsApp client instance for sending responses
         """
         self.whatsapp_client = whatsapp_client
-        self.intent_recognizer = IntentRecognizer()
-        self.entity_extractor = EntityExtractor()
-        self.email_service = EmailService()
-        self.calendar_service = CalendarService()
-        self.contacts_service = ContactsService()
-        self.contacts_db_service = ContactsDBService()
-        self.tender_service = TenderService()
+        self.intent_recognizer = _shared(IntentRecognizer)
+        self.entity_extractor = _shared(EntityExtractor)
+        self.email_service = _shared(EmailService)
+        self.calendar_service = _shared(CalendarService)
+        self.contacts_service = _shared(ContactsService)
+        self.contacts_db_service = _shared(ContactsDBService)
+        self.tender_service = _shared(TenderService)
         self.file_processor = FileProcessor(calendar_service=self.calendar_service)
         
-        # User state for multi-step conversations
-        self.user_state = {}
+        # User state for multi-step conversations; idle ones expire
+        self.user_state = ConversationStore()
+        
+        # Contacts resolved by _find_contact, keyed by normalized name
+        self._contact_cache = TTLCache(CONTACT_CACHE_SIZE, CONTACT_CACHE_TTL)
     
     def __call__(self, from_number, message_text, media_url=None, media_type=None):
-        """
-        Handle incoming WhatsApp messages.
-        """
-        try:
-            # Check for ongoing conversations first
-            if from_number in self.user_state:
-                print(f"Continuing conversation for {from_number} with state: {self.user_state[from_number]}")
-                conversation_state = self.user_state[from_number]
-
-                # Handle file uploads for 'process tenders' workflow
-                if conversation_state.get("type") == "tender" and media_url and media_type:
-                    if any(x in media_type.lower() for x in ['csv', 'spreadsheet', 'excel', 'xls']):
-                        # Process the file
-                        self.file_processor.process_file_from_url(media_url, media_type, from_number)
-                        # Clear the state
-                        del self.user_state[from_number]
-                        return
-                    else:
-                        self._send_response(from_number, 
-                            "❌ Please send a CSV or Excel file. Other file types are not supported."
-                        )
-                        return
-
-                # Continue other conversation flows
-                conversation_handled = self._continue_conversation(from_number, message_text)
-                if conversation_handled:
-                    return
-
-            # Process new messages
-            print(f"Processing new message from {from_number}: {message_text}")
-            
-            # Extract entities before intent recognition for better context
-            entities = self.entity_extractor.extract_entities(message_text)
-            print(f"Extracted entities: {entities}")
-            
-            # Recognize intent
-            intent_data = self.intent_recognizer.recognize_intent(message_text)
-            intent = intent_data.get("intent", INTENT_UNKNOWN)
-            confidence = intent_data.get("confidence", 0)
-            print(f"Recognized intent: {intent} with confidence: {confidence}")
-            
-            # Handle different intents
-            if intent == INTENT_PROCESS_TENDERS:
-                print("Invoking _handle_process_tenders")
-                self.user_state[from_number] = {"type": "tender", "step": "awaiting_file"}
-                self._send_response(from_number, 
-                    "Please upload a CSV or Excel file containing tender information with the following columns:\n"
-                    "- tender_name\n"
-                    "- email\n"
-                    "- bidding_date"
-                )
-                return
-                
-            elif intent == INTENT_SCHEDULE_MEETING:
-                print("Invoking _handle_schedule_meeting")
-                self._handle_schedule_meeting(from_number, message_text, entities)
-                
-            elif intent == INTENT_CHECK_CALENDAR:
-                print("Invoking _handle_check_calendar")
-                self._handle_check_calendar(from_number, message_text, entities)
-                
-            elif intent == INTENT_FIND_CONTACT:
-                print("Invoking _handle_find_contact")
-                self._handle_find_contact(from_number, message_text, entities)
-                
-            elif intent == INTENT_SEND_EMAIL:
-                print("Invoking _handle_send_email")
-                self._handle_send_email(from_number, message_text, entities)
-                
-            else:
-                # Default response for unknown intents
-                print("Unknown intent. Sending default response.")
-                send_whatsapp_message(from_number, 
-                    "I can help you with:\n"
-                    "- Processing tender files and setting reminders\n"
-                    "- Scheduling meetings\n"
-                    "- Checking your calendar\n"
-                    "- Finding contacts\n"
-                    "- Sending emails\n\n"
-                    "How can I assist you today?"
-                )
-            
-        except Exception as e:
-            print(f"Error processing message: {e}")
-            traceback.print_exc()
-            send_whatsapp_message(from_number, f"Sorry, an error occurred: {str(e)}")
+        """Handle incoming WhatsApp messages (webhook entry point)."""
+        return self.handle_message(from_number, message_text, media_url, media_type)
     
     def handle_message(self, from_number, message_text, media_url=None, media_type=None):
         """
         Process incoming WhatsApp messages.
         
+        Callers keep one sender's messages in order: the webhook routes each
+        sender to a single worker and the CLI runs on one thread.
+        
         Args:
             from_number: Sender's phone number
             message_text: Message content
             media_url: URL to attached media (optional)
             media_type: Content type of attached media (optional)
         """
+        self._handle_incoming(from_number, message_text, media_url, media_type)
+    
+    def _handle_incoming(self, from_number, message_text, media_url=None, media_type=None):
+        """
+        Handle an incoming WhatsApp message.
+        """
         try:
+            # One store lookup per message; handlers update the state in place
+            state = self.user_state.get(from_number)
+            
             # Handle file attachments for tender processing
-            if (media_url and media_type):
-                print(f"Received media: {media_type} from {media_url}")
+            if media_url and media_type:
+                logger.info("Received media: %s from %s", media_type, media_url)
                 
-                if from_number in self.user_state and self.user_state[from_number].get("type") == "tender":
-                    if any(x in media_type.lower() for x in ['csv', 'spreadsheet', 'excel', 'xls']):
+                if state is not None and state.type == "tender":
+                    if _is_spreadsheet(media_type):
                         # Process the file
                         self.file_processor.process_file_from_url(media_url, media_type, from_number)
                         # Clear the state
-                        del self.user_state[from_number]
-                        return
+                        self.user_state.pop(from_number, None)
                     else:
-                        self._send_response(from_number, 
-                            "❌ Please send a CSV or Excel file. Other file types are not supported."
-                        )
-                        return
+                        self._reply(from_number, "unsupported_file")
                 else:
                     self._send_response(from_number,
                         "I received your file, but I'm not sure what to do with it. "
                         "If you want to set up tender reminders, please say 'process tenders' first."
                     )
-                    return
+                return
 
-            print(f"Received message from {from_number}: {message_text}")
-            
-            # For debugging, print current user state
-            if from_number in self.user_state:
-                print(f"Current user state: {self.user_state[from_number]}")
-            else:
-                print("No existing conversation state")
+            logger.debug("Received message from %s: %s", from_number, message_text)
             
             # Check for sync command
             if message_text.lower() == "sync contacts":
@@ -197,41 +307,34 @@ class MessageHandler:
                 return
                 
             # Always prioritize ongoing conversations
-            if from_number in self.user_state:
-                conversation_handled = self._continue_conversation(from_number, message_text)
-                if conversation_handled:
-                    print("Handled as part of ongoing conversation")
-                    return  # Exit early if conversation was handled
+            if state is not None:
+                logger.debug("Continuing conversation for %s with state: %s", from_number, state)
+                if self._continue_conversation(from_number, message_text, state):
+                    return
             
             # Process new intent if not in a conversation
-            intent_data = self.intent_recognizer.recognize_intent(message_text)
-            intent = intent_data["intent"]
-            confidence = intent_data.get("confidence", 0)
-            
-            print(f"Detected intent: {intent} with confidence: {confidence}")
-            
-            # Extract entities
-            entities = self.entity_extractor.extract_entities(message_text, intent)
-            print(f"Extracted entities: {entities}")
+            intent, entities = self._analyze(message_text)
             
             # Process based on intent
-            if intent == IntentRecognizer.INTENT_SEND_EMAIL:
+            if intent == INTENT_SEND_EMAIL:
                 self._handle_send_email(from_number, message_text, entities)
                     
-            elif intent == IntentRecognizer.INTENT_SCHEDULE_MEETING:
+            elif intent == INTENT_SCHEDULE_MEETING:
                 self._handle_schedule_meeting(from_number, message_text, entities)
                     
-            elif intent == IntentRecognizer.INTENT_CHECK_CALENDAR:
+            elif intent == INTENT_CHECK_CALENDAR:
                 self._handle_check_calendar(from_number, message_text, entities)
                     
-            elif intent == IntentRecognizer.INTENT_FIND_CONTACT:
+            elif intent == INTENT_FIND_CONTACT:
                 self._handle_find_contact(from_number, message_text, entities)
                     
-            elif intent == IntentRecognizer.INTENT_CHECK_FREE_SLOTS:
+            elif intent == INTENT_CHECK_FREE_SLOTS:
                 self._handle_check_free_slots(from_number, message_text, entities)
 
-            elif intent == IntentRecognizer.INTENT_PROCESS_TENDERS:
-                self._handle_process_tenders(from_number, message_text, media_url, media_type)
+            elif intent == INTENT_PROCESS_TENDERS:
+                # Wait for the file; it's handled by the attachment branch above
+                self.user_state[from_number] = ConversationState("tender", "awaiting_file")
+                self._reply(from_number, "tender_upload")
                     
             else:
                 # Unknown intent
@@ -248,345 +351,428 @@ class MessageHandler:
         
         except Exception as e:
             # Log the error and send an apologetic message
-            print(f"Error handling message: {e}")
-            traceback.print_exc()
+            logger.exception("Error handling message: %s", e)
             self._send_response(
                 from_number,
                 "I'm sorry, I encountered an error while processing your request. "
                 "Please try again or rephrase your request."
             )
     
-    def _continue_conversation(self, from_number, message_text):
+    def _analyze(self, message_text):
+        """
+        Recognize the intent of a new message and extract its entities.
+        
+        Bare commands such as "process tenders" and trivially short replies
+        skip the intent models. Entities are only extracted for intents whose
+        handlers use them, so tender requests and unrecognized messages skip
+        the NER pass.
+        
+        Args:
+            message_text: Message content
+            
+        Returns:
+            Tuple of (intent, entities); entities is None when not needed
+        """
+        lowered = message_text.strip().lower()
+        if lowered in _KEYWORD_INTENTS:
+            intent_data = {"intent": _KEYWORD_INTENTS[lowered], "confidence": 1.0}
+        elif len(lowered) < 3 or lowered.isdigit():
+            # Stray digits or "ok" outside a conversation carry no intent
+            intent_data = {"intent": INTENT_UNKNOWN, "confidence": 1.0}
+        else:
+            intent_data = self.intent_recognizer.recognize_intent(message_text)
+        intent = intent_data.get("intent", INTENT_UNKNOWN)
+        confidence = intent_data.get("confidence", 0)
+        
+        logger.debug("Detected intent: %s with confidence: %s", intent, confidence)
+        
+        if intent not in _INTENTS_WITH_ENTITIES:
+            return intent, None
+        
+        # The LLM result is cached from recognize_intent, so this reuses it
+        entities = self.entity_extractor.extract_entities(message_text, intent)
+        logger.debug("Extracted entities: %s", entities)
+        return intent, entities
+    
+    def _continue_conversation(self, from_number, message_text, state):
         """
         Continue an ongoing conversation.
         
         Args:
             from_number: Sender's phone number
             message_text: Message content
-            
+            state: The sender's ConversationState
+        
         Returns:
             True if conversation was continued, False otherwise
         """
-        state = self.user_state[from_number]
-        conversation_type = state.get("type")
-        step = state.get("step")
-        
-        # Different conversation flows
-        if conversation_type == "email":
-            if step == "recipient":
-                # User provided recipient
-                if message_text.lower() == "cancel":
-                    self._send_response(from_number, "Email canceled.")
-                    del self.user_state[from_number]
-                    return True
-                
-                state["recipient"] = message_text
-                self._send_response(from_number, 
-                    "What's the subject of the email? (or type 'cancel' to abort)"
-                )
-                state["step"] = "subject"
-                return True
-                
-            elif step == "subject":
-                # User provided subject
-                if message_text.lower() == "cancel":
-                    self._send_response(from_number, "Email canceled.")
-                    del self.user_state[from_number]
-                    return True
-                
-                state["subject"] = message_text
-                self._send_response(from_number, 
-                    "What's the content of the email? (or type 'cancel' to abort)"
-                )
-                state["step"] = "body"
-                return True
+        handler = self._STEP_HANDLERS.get((state.type, state.step))
+        if handler is None:
+            # No ongoing conversation or unhandled state
+            return False
+        return handler(self, from_number, message_text, message_text.lower(), state)
+    
+    def _continue_email_recipient(self, from_number, message_text, lowered, state):
+        """Take the email recipient and ask for the subject."""
+        # User provided recipient
+        if lowered == "cancel":
+            self._reply(from_number, "email_canceled")
+            self.user_state.pop(from_number, None)
+            return True
+        
+        state.recipient = message_text
+        self._reply(from_number, "ask_email_subject")
+        state.step = "subject"
+        return True
+    
+    def _continue_email_subject(self, from_number, message_text, lowered, state):
+        """Take the email subject and ask for the body."""
+        # User provided subject
+        if lowered == "cancel":
+            self._reply(from_number, "email_canceled")
+            self.user_state.pop(from_number, None)
+            return True
+        
+        state.subject = message_text
+        self._reply(from_number, "ask_email_body")
+        state.step = "body"
+        return True
+    
+    def _continue_email_body(self, from_number, message_text, lowered, state):
+        """Take the email body and ask for confirmation."""
+        # User provided body
+        if lowered == "cancel":
+            self._reply(from_number, "email_canceled")
+            self.user_state.pop(from_number, None)
+            return True
+        
+        state.body = message_text
+        
+        # Ask for confirmation
+        self._send_response(from_number, 
+            f"I'll send an email with:\n"
+            f"To: {state.recipient}\n"
+            f"Subject: {state.subject}\n"
+            f"Body: {state.body}\n\n"
+            f"Send it? (yes/no)"
+        )
+        state.step = "confirm"
+        return True
+    
+    def _continue_email_confirm(self, from_number, message_text, lowered, state):
+        """Resolve the recipient and send the email once the user confirms."""
+        # User confirmed
+        if lowered in _CONFIRM_EMAIL:
+            # Try to find contact if recipient is not an email
+            recipient = state.recipient
+            if "@" not in recipient:
+                # Google and the local DB are queried concurrently
+                contact = self._find_contact(recipient)
                 
-            elif step == "body":
-                # User provided body
-                if message_text.lower() == "cancel":
-                    self._send_response(from_number, "Email canceled.")
-                    del self.user_state[from_number]
+                if contact and contact.get("email"):
+                    recipient = contact["email"]
+                else:
+                    self._send_response(from_number, 
+                        f"I couldn't find an email for '{recipient}'. "
+                        f"Please provide a valid email address or contact name."
+                    )
+                    state.step = "recipient"
                     return True
-                
-                state["body"] = message_text
-                
-                # Ask for confirmation
+            
+            # Send the email
+            result = self.email_service.send_email(
+                to=recipient,
+                subject=state.subject,
+                body=state.body
+            )
+            
+            if result["success"]:
                 self._send_response(from_number, 
-                    f"I'll send an email with:\n"
-                    f"To: {state['recipient']}\n"
-                    f"Subject: {state['subject']}\n"
-                    f"Body: {state['body']}\n\n"
-                    f"Send it? (yes/no)"
+                    "Email sent successfully!"
                 )
-                state["step"] = "confirm"
-                return True
-                
-            elif step == "confirm":
-                # User confirmed
-                if message_text.lower() in ["yes", "y", "sure", "ok", "send"]:
-                    # Try to find contact if recipient is not an email
-                    recipient = state["recipient"]
-                    if "@" not in recipient:
-                        # Try Google Contacts first
-                        contact = None
-                        try:
-                            contact = self.contacts_service.get_contact_by_name(recipient)
-                        except Exception as e:
-                            print(f"Error finding contact via Google: {e}")
-                        
-                        # If not found in Google, try local DB
-                        if not contact or not contact.get("email"):
-                            try:
-                                contact = self.contacts_db_service.get_contact_by_name(recipient)
-                            except Exception as e:
-                                print(f"Error finding contact in local DB: {e}")
-                        
-                        if contact and contact.get("email"):
-                            recipient = contact["email"]
-                        else:
-                            self._send_response(from_number, 
-                                f"I couldn't find an email for '{recipient}'. "
-                                f"Please provide a valid email address or contact name."
-                            )
-                            state["step"] = "recipient"
-                            return True
-                    
-                    # Send the email
-                    result = self.email_service.send_email(
-                        to=recipient,
-                        subject=state["subject"],
-                        body=state["body"]
-                    )
-                    
-                    if result["success"]:
-                        self._send_response(from_number, 
-                            "Email sent successfully!"
-                        )
-                    else:
-                        self._send_response(from_number, 
-                            f"Failed to send email: {result.get('error', 'Unknown error')}"
-                        )
-                    
-                    # Clear state
-                    del self.user_state[from_number]
-                    
+            else:
+                self._reply(from_number, "email_failed", error=result.get('error', 'Unknown error'))
+            
+            # Clear state
+            self.user_state.pop(from_number, None)
+        
+        else:
+            self._reply(from_number, "email_canceled")
+            self.user_state.pop(from_number, None)
+        
+        return True
+    
+    def _continue_meeting_person(self, from_number, message_text, lowered, state):
+        """Take the person to meet, checking anything that looks like an email."""
+        # User provided person
+        if lowered == "cancel":
+            self._reply(from_number, "meeting_canceled")
+            self.user_state.pop(from_number, None)
+            return True
+        
+        # Check if it's an email
+        if '@' in message_text or '.' in message_text:
+            is_valid, error_msg, suggestion = is_valid_email(message_text)
+            
+            if not is_valid:
+                response = f"The email '{message_text}' appears to be invalid. {error_msg}"
+                if suggestion:
+                    response += f"\n\nDid you mean '{suggestion}'? Please confirm or provide a correct email."
+                    # Save the suggestion for later use
+                    state.suggested_email = suggestion
+                    state.step = "confirm_email"
                 else:
-                    self._send_response(from_number, "Email canceled.")
-                    del self.user_state[from_number]
+                    response += "\n\nPlease provide a valid email address."
                 
+                self._send_response(from_number, response)
                 return True
         
-        elif conversation_type == "meeting":
-            if step == "person":
-                # User provided person
-                if message_text.lower() == "cancel":
-                    self._send_response(from_number, "Meeting scheduling canceled.")
-                    del self.user_state[from_number]
-                    return True
-                
-                # Check if it's an email
-                if '@' in message_text or '.' in message_text:
-                    is_valid, error_msg, suggestion = is_valid_email(message_text)
-                    
-                    if not is_valid:
-                        response = f"The email '{message_text}' appears to be invalid. {error_msg}"
-                        if suggestion:
-                            response += f"\n\nDid you mean '{suggestion}'? Please confirm or provide a correct email."
-                            # Save the suggestion for later use
-                            state["suggested_email"] = suggestion
-                            state["step"] = "confirm_email"
-                        else:
-                            response += "\n\nPlease provide a valid email address."
-                        
-                        self._send_response(from_number, response)
-                        return True
-                
-                state["person"] = message_text
-                
-                # If we already have a date, ask for time
-                if "date" in state:
-                    self._send_response(from_number, 
-                        f"What time on {format_date(state['date'])}? (or type 'cancel' to abort)"
-                    )
-                    state["step"] = "time"
+        state.person = message_text
+        
+        # If we already have a date, ask for time
+        if state.date is not None:
+            self._reply(from_number, "ask_meeting_time", date=format_date(state.date))
+            state.step = "time"
+        else:
+            self._reply(from_number, "ask_meeting_date")
+            state.step = "date"
+        
+        return True
+    
+    def _continue_meeting_confirm_email(self, from_number, message_text, lowered, state):
+        """Accept the suggested email correction or a new address."""
+        # Allow cancellation
+        if lowered == "cancel":
+            self._reply(from_number, "meeting_canceled")
+            self.user_state.pop(from_number, None)
+            return True
+        
+        # User confirmed the suggested email
+        elif lowered in _CONFIRM_CONTACT:
+            state.person = state.suggested_email
+            state.suggested_email = None
+            
+            # Continue with date
+            self._reply(from_number, "ask_meeting_date")
+            state.step = "date"
+            return True
+        
+        # User provided a different email
+        elif '@' in message_text:
+            is_valid, error_msg, suggestion = is_valid_email(message_text)
+            
+            if not is_valid:
+                response = f"The email '{message_text}' still appears to be invalid. {error_msg}"
+                if suggestion:
+                    response += f"\n\nDid you mean '{suggestion}'?"
+                    state.suggested_email = suggestion
                 else:
-                    self._send_response(from_number, 
-                        "What date? (or type 'cancel' to abort)"
-                    )
-                    state["step"] = "date"
+                    response += "\n\nPlease provide a valid email address."
                 
+                self._send_response(from_number, response)
                 return True
-                
-            elif step == "confirm_email":
-                
-                # Allow cancellation
-                if message_text.lower() == "cancel":
-                    self._send_response(from_number, "Meeting scheduling canceled.")
-                    del self.user_state[from_number]
-                    return True
-                
-                # User confirmed the suggested email
-                elif message_text.lower() in ["yes", "y", "correct", "confirm", "right"]:
-                    state["person"] = state["suggested_email"]
-                    del state["suggested_email"]
-                    
-                    # Continue with date
-                    self._send_response(from_number, 
-                        "What date? (or type 'cancel' to abort)"
-                    )
-                    state["step"] = "date"
-                    return True
-                    
-                # User provided a different email
-                elif '@' in message_text:
-                    is_valid, error_msg, suggestion = is_valid_email(message_text)
-                    
-                    if not is_valid:
-                        response = f"The email '{message_text}' still appears to be invalid. {error_msg}"
-                        if suggestion:
-                            response += f"\n\nDid you mean '{suggestion}'?"
-                            state["suggested_email"] = suggestion
-                        else:
-                            response += "\n\nPlease provide a valid email address."
-                        
-                        self._send_response(from_number, response)
-                        return True
-                        
-                    # Email is valid
-                    state["person"] = message_text
-                    del state["suggested_email"]
-                    
-                    # Continue with date
-                    self._send_response(from_number, 
-                        "What date? (or type 'cancel' to abort)"
-                    )
-                    state["step"] = "date"
-                    return True
-                    
-                else:
-                    # User rejected suggestion but didn't provide a new email
-                    self._send_response(from_number, 
-                        "Please provide a valid email address or type 'cancel' to abort."
-                    )
-                    return True
-                    
-            elif step == "date":
-                # User provided date
-                if message_text.lower() == "cancel":
-                    self._send_response(from_number, "Meeting scheduling canceled.")
-                    del self.user_state[from_number]
-                    return True
-                
-                # Extract date
-                entities = self.entity_extractor.extract_entities(message_text)
-                date = entities.get("date")
-                
-                if not date:
-                    self._send_response(from_number, 
-                        "I couldn't understand that date. Please provide a specific date "
-                        "like 'tomorrow', 'next Friday', or 'May 15th'."
-                    )
-                    return True
-                
-                # Check if date is in the past
-                current_date = get_current_time().date()
-                print(f"Comparing dates - Input date: {date} (type: {type(date)}), Current date: {current_date}")
-                if date < current_date:
-                    # Format dates for display
-                    formatted_input_date = f"{date.day:02d}/{date.month:02d}/{date.year}"
-                    formatted_current_date = f"{current_date.day:02d}/{current_date.month:02d}/{current_date.year}"
-                    self._send_response(from_number, 
-                        f"The date {formatted_input_date} has already passed. Today is {formatted_current_date}. "
-                        f"Please provide a future date."
-                    )
-                    return True
-                
-                state["date"] = date
-                
-                # If we already have a time, check availability
-                if "time" in state:
-                    return self._check_meeting_availability(from_number, state)
-                else:
-                    self._send_response(from_number, 
-                        f"What time on {format_date(date)}? (or type 'cancel' to abort)"
-                    )
-                    state["step"] = "time"
-                
+            
+            # Email is valid
+            state.person = message_text
+            state.suggested_email = None
+            
+            # Continue with date
+            self._reply(from_number, "ask_meeting_date")
+            state.step = "date"
+            return True
+        
+        else:
+            # User rejected suggestion but didn't provide a new email
+            self._send_response(from_number, 
+                "Please provide a valid email address or type 'cancel' to abort."
+            )
+            return True
+    
+    def _continue_meeting_date(self, from_number, message_text, lowered, state):
+        """Take the meeting date and ask for a time if needed."""
+        # User provided date
+        if lowered == "cancel":
+            self._reply(from_number, "meeting_canceled")
+            self.user_state.pop(from_number, None)
+            return True
+        
+        # Extract date
+        date = self._extract_reply_entity(message_text, "date")
+        
+        if not date:
+            self._reply(from_number, "invalid_date")
+            return True
+        
+        # Check if date is in the past
+        current_date = get_current_time().date()
+        logger.debug("Comparing dates - Input date: %s (type: %s), Current date: %s", date, type(date), current_date)
+        if date < current_date:
+            # Format dates for display
+            formatted_input_date = f"{date.day:02d}/{date.month:02d}/{date.year}"
+            formatted_current_date = f"{current_date.day:02d}/{current_date.month:02d}/{current_date.year}"
+            self._send_response(from_number, 
+                f"The date {formatted_input_date} has already passed. Today is {formatted_current_date}. "
+                f"Please provide a future date."
+            )
+            return True
+        
+        state.date = date
+        
+        # If we already have a time, check availability
+        if state.time is not None:
+            return self._check_meeting_availability(from_number, state)
+        else:
+            self._reply(from_number, "ask_meeting_time", date=format_date(date))
+            state.step = "time"
+        
+        return True
+    
+    def _continue_meeting_time(self, from_number, message_text, lowered, state):
+        """Take the meeting time and check availability."""
+        # User provided time
+        if lowered == "cancel":
+            self._reply(from_number, "meeting_canceled")
+            self.user_state.pop(from_number, None)
+            return True
+        
+        # Extract time
+        time = self._extract_reply_entity(message_text, "time")
+        
+        if not time:
+            self._reply(from_number, "invalid_time")
+            return True
+        
+        # Ensure time is a datetime.time object
+        if isinstance(time, str):
+            try:
+                # Try to parse the time string
+                time_obj = datetime.datetime.strptime(time, "%H:%M").time()
+                time = time_obj
+            except ValueError:
+                self._reply(from_number, "invalid_time_format")
                 return True
-                
-            elif step == "time":
-                # User provided time
-                if message_text.lower() == "cancel":
-                    self._send_response(from_number, "Meeting scheduling canceled.")
-                    del self.user_state[from_number]
-                    return True
-                
-                # Extract time
-                entities = self.entity_extractor.extract_entities(message_text)
-                time = entities.get("time")
-                
-                if not time:
-                    self._send_response(from_number, 
-                        "I couldn't understand that time. Please provide a specific time "
-                        "like '3pm', '15:30', or 'at 2 o'clock'."
-                    )
-                    return True
-                
-                # Ensure time is a datetime.time object
-                if isinstance(time, str):
-                    try:
-                        # Try to parse the time string
-                        time_obj = datetime.datetime.strptime(time, "%H:%M").time()
-                        time = time_obj
-                    except ValueError:
-                        self._send_response(from_number, 
-                            "I couldn't process that time format. Please use HH:MM format (e.g. 13:00)."
-                        )
-                        return True
-                
-                state["time"] = time
-                print(f"Set time in state: {time} (type: {type(time)})")
-                
-                # Check availability
-                return self._check_meeting_availability(from_number, state)
-                
-            elif step == "confirm":
-                # User confirmed or selected a slot
-                if message_text.lower() in ["yes", "y", "sure", "ok", "book", "1"]:
-                    # Book the meeting
-                    return self._book_meeting(from_number, state)
-                elif message_text.lower() in ["no", "n", "nope", "cancel"]:
-                    self._send_response(from_number, "Meeting scheduling canceled.")
-                    del self.user_state[from_number]
-                    return True
-                elif message_text.isdigit():
-                    # User selected an alternative slot
-                    slot_index = int(message_text) - 1
-                    if 0 <= slot_index < len(state.get("alternative_slots", [])):
-                        slot = state["alternative_slots"][slot_index]
-                        
-                        # Update state with selected slot
-                        state["date"] = slot[0].date()
-                        state["time"] = slot[0].time()
-                        state["end_time"] = slot[1].time()
-                        
-                        # Book the meeting
-                        return self._book_meeting(from_number, state)
-                    else:
-                        self._send_response(from_number, 
-                            "Invalid selection. Please choose a number from the list "
-                            "or type 'cancel' to abort."
-                        )
-                        return True
-                else:
-                    self._send_response(from_number, 
-                        "I didn't understand your response. Please answer with 'yes', 'no', "
-                        "or the number of an alternative slot."
-                    )
-                    return True
         
-        # No ongoing conversation or unhandled state
-        return False
+        state.time = time
+        logger.debug("Set time in state: %s (type: %s)", time, type(time))
+        
+        # Check availability
+        return self._check_meeting_availability(from_number, state)
+    
+    def _continue_meeting_confirm(self, from_number, message_text, lowered, state):
+        """Book the meeting or the chosen alternative slot."""
+        # User confirmed or selected a slot; "1" only confirms when there are
+        # no alternatives, otherwise it picks the first one
+        if lowered in _CONFIRM_BOOKING or (lowered == "1" and not state.alternative_slots):
+            # Book the meeting
+            return self._book_meeting(from_number, state)
+        elif lowered in _DECLINE_BOOKING:
+            self._reply(from_number, "meeting_canceled")
+            self.user_state.pop(from_number, None)
+            return True
+        elif message_text.isdigit():
+            # User selected an alternative slot
+            slot_index = int(message_text) - 1
+            if 0 <= slot_index < len(state.alternative_slots or ()):
+                slot = state.alternative_slots[slot_index]
+                
+                # Update state with selected slot
+                state.date = slot[0].date()
+                state.time = slot[0].time()
+                state.end_time = slot[1].time()
+                
+                # Book the meeting
+                return self._book_meeting(from_number, state)
+            else:
+                self._reply(from_number, "invalid_slot")
+                return True
+        else:
+            self._reply(from_number, "unclear_confirmation")
+            return True
+    
+    # Step handlers for _continue_conversation, keyed by (conversation type, step)
+    _STEP_HANDLERS = {
+        ("email", "recipient"): _continue_email_recipient,
+        ("email", "subject"): _continue_email_subject,
+        ("email", "body"): _continue_email_body,
+        ("email", "confirm"): _continue_email_confirm,
+        ("meeting", "person"): _continue_meeting_person,
+        ("meeting", "confirm_email"): _continue_meeting_confirm_email,
+        ("meeting", "date"): _continue_meeting_date,
+        ("meeting", "time"): _continue_meeting_time,
+        ("meeting", "confirm"): _continue_meeting_confirm
+    }
+
+    def _extract_reply_entity(self, message_text, key):
+        """
+        Extract a date or time from a reply in an ongoing conversation.
+        
+        Args:
+            message_text: Message content
+            key: "date" or "time"
+            
+        Returns:
+            The extracted value, or None if none was found
+        """
+        # Cheap regex/dateparser pass first; the LLM and NER models only run
+        # for replies it can't make sense of
+        value = self.entity_extractor.extract_datetime(message_text).get(key)
+        if not value:
+            value = self.entity_extractor.extract_entities(message_text).get(key)
+        return value
+    
+    def _find_contact(self, name):
+        """
+        Look up a contact in Google Contacts and the local DB concurrently.
+        
+        Google's match is preferred when it has an email; otherwise the local
+        DB's is used. A slow Google lookup delays the fallback by at most
+        CONTACT_LOOKUP_TIMEOUT seconds instead of its full request time.
+        Contacts with an email are cached for CONTACT_CACHE_TTL seconds, so
+        the availability check, booking and invitation share one lookup.
+        Google matches are also stored in the local DB for
+        CONTACT_DISK_CACHE_TTL seconds, so a restart doesn't lose them.
+        
+        Args:
+            name: Contact name to search for
+            
+        Returns:
+            Contact dict, or None if neither source has a match
+        """
+        key = name.strip().lower()
+        contact = self._contact_cache.get(key)
+        if contact is not None:
+            return contact
+        
+        contact = self.contacts_db_service.get_cached_lookup(key, CONTACT_DISK_CACHE_TTL)
+        if contact is not None:
+            self._contact_cache.set(key, contact)
+            return contact
+        
+        google = _contact_lookups.submit(self.contacts_service.get_contact_by_name, name)
+        local = _contact_lookups.submit(self.contacts_db_service.get_contact_by_name, name)
+        
+        contact = None
+        try:
+            contact = google.result(timeout=CONTACT_LOOKUP_TIMEOUT)
+        except FuturesTimeout:
+            logger.warning("Google contact lookup for %s timed out; using local DB", name)
+        except Exception as e:
+            logger.error("Error finding contact via Google: %s", e)
+        
+        if contact and contact.get("email"):
+            self.contacts_db_service.cache_lookup(key, contact)
+        
+        # If not found in Google, use the local DB
+        if not contact or not contact.get("email"):
+            try:
+                contact = local.result()
+            except Exception as e:
+                logger.error("Error finding contact in local DB: %s", e)
+        
+        # Misses aren't cached; the contact may be added or synced any moment
+        if contact and contact.get("email"):
+            self._contact_cache.set(key, contact)
+        return contact
     
     def _check_meeting_availability(self, from_number, state):
         """
@@ -599,10 +785,10 @@ class MessageHandler:
         Returns:
             True to indicate the conversation was handled
         """
-        print(f"TIME_ZONE from config: {TIME_ZONE}")
-        date = state["date"]
-        time = state["time"]
-        print(f"Raw time from state: {time}")
+        logger.debug("TIME_ZONE from config: %s", TIME_ZONE)
+        date = state.date
+        time = state.time
+        logger.debug("Raw time from state: %s", time)
         
         # Create datetime objects
         try:
@@ -612,7 +798,7 @@ class MessageHandler:
             # Create a timezone-aware datetime for the requested meeting time
             start_dt = datetime.datetime.combine(date, time)
             # Make it timezone-aware
-            start_dt = pytz.timezone(TIME_ZONE).localize(start_dt)
+            start_dt = _TZ.localize(start_dt)
             
             # Check if datetime is in the past
             if start_dt < current_dt:
@@ -622,66 +808,47 @@ class MessageHandler:
                     f"Current time is {current_dt.strftime('%H:%M')}. "
                     f"Please provide a future time."
                 )
-                state["step"] = "time"
+                state.step = "time"
                 return True
             
             # Set default duration if not specified
-            duration = state.get("duration", 30)  # Default 30 minutes
+            duration = state.duration or 30  # Default 30 minutes
             end_dt = start_dt + datetime.timedelta(minutes=duration)
             
             # Assign end time to state
-            state["end_time"] = end_dt.time()
+            state.end_time = end_dt.time()
             
-            # Check calendar for conflicts - simplified approach
+            # Check calendar for conflicts and alternatives in one listing;
+            # it's cached briefly, so re-checking the same day is free
             try:
-                # Convert to ISO format for the API
-                time_min = start_dt.isoformat()
-                time_max = end_dt.isoformat()
-                
-                events_result = self.calendar_service.service.events().list(
-                    calendarId='primary',
-                    timeMin=time_min,
-                    timeMax=time_max,
-                    maxResults=10,
-                    singleEvents=True,
-                    orderBy='startTime'
-                ).execute()
-                
-                events = events_result.get('items', [])
-                
+                has_conflict, free_slots = self.calendar_service.check_availability(
+                    start_dt,
+                    end_dt,
+                    day_start_time=datetime.time(8, 0),  # 8 AM
+                    day_end_time=datetime.time(18, 0),   # 6 PM
+                    duration_minutes=duration,
+                    max_slots=5
+                )
             except Exception as e:
-                print(f"Calendar API error checking conflicts: {e}")
-                events = []  # Assume no conflicts on error
+                logger.error("Calendar API error checking conflicts: %s", e)
+                has_conflict, free_slots = False, []  # Assume no conflicts on error
             
-            if events:
+            if has_conflict:
                 # There's a conflict
-                try:
-                    free_slots = self.calendar_service.get_free_slots(
-                        date=date,
-                        start_time=datetime.time(8, 0),  # 8 AM
-                        end_time=datetime.time(18, 0),   # 6 PM
-                        duration_minutes=duration
-                    )
-                except Exception as e:
-                    print(f"Error getting free slots: {e}")
-                    free_slots = []
-                
                 if not free_slots:
                     self._send_response(from_number, 
                         f"I'm sorry, you don't have any free {duration}-minute slots "
                         f"on {format_date(date)}. Would you like to try another date?"
                     )
-                    state["step"] = "date"
+                    state.step = "date"
                     return True
                 
-                # Find and suggest alternative slots
-                formatted_slots = []
-                state["alternative_slots"] = []
-                
-                # Limit to 5 suggestions
-                for i, (slot_start, slot_end) in enumerate(free_slots[:5]):
-                    formatted_slots.append(f"{i+1}. {format_time(slot_start)} - {format_time(slot_end)}")
-                    state["alternative_slots"].append((slot_start, slot_end))
+                # Suggest up to 5 alternative slots; the reply picks one by number
+                state.alternative_slots = tuple(free_slots)
+                formatted_slots = [
+                    f"{i}. {format_time(slot_start)} - {format_time(slot_end)}"
+                    for i, (slot_start, slot_end) in enumerate(state.alternative_slots, 1)
+                ]
                 
                 self._send_response(from_number, 
                     f"You already have a meeting at {format_time(time)} on {format_date(date)}. "
@@ -689,28 +856,17 @@ class MessageHandler:
                     "\n".join(formatted_slots) +
                     "\n\nPlease choose a slot by number, or type 'cancel' to abort."
                 )
-                state["step"] = "confirm"
+                state.step = "confirm"
                 
             else:
                 # Slot is available, ask for confirmation
-                person = state.get("person", "the person")
+                person = state.person or "the person"
                 
                 # Try to find contact if it's a name
                 contact_info = ""
                 if "@" not in person:
-                    # Try Google Contacts first
-                    contact = None
-                    try:
-                        contact = self.contacts_service.get_contact_by_name(person)
-                    except Exception as e:
-                        print(f"Error finding contact via Google: {e}")
-                    
-                    # If not found in Google, try local DB
-                    if not contact or not contact.get("email"):
-                        try:
-                            contact = self.contacts_db_service.get_contact_by_name(person)
-                        except Exception as e:
-                            print(f"Error finding contact in local DB: {e}")
+                    # Google and the local DB are queried concurrently
+                    contact = self._find_contact(person)
                     
                     if contact and contact.get("email"):
                         contact_info = f" ({contact['email']})"
@@ -720,17 +876,16 @@ class MessageHandler:
                     f"on {format_date(date)} at {format_time(time)}. "
                     f"Is that correct? (yes/no)"
                 )
-                state["step"] = "confirm"
+                state.step = "confirm"
             
             return True
             
         except Exception as e:
-            print(f"Error checking meeting availability: {e}")
-            traceback.print_exc()  # Add stack trace for debugging
+            logger.exception("Error checking meeting availability: %s", e)
             self._send_response(from_number, 
                 "I couldn't process the meeting time. Please try again with a different format."
             )
-            del self.user_state[from_number]
+            self.user_state.pop(from_number, None)
             return True
     
     def _book_meeting(self, from_number, state):
@@ -745,38 +900,24 @@ class MessageHandler:
             True to indicate the conversation was handled
         """
         try:
-            person = state["person"]
-            date = state["date"]
-            time = state["time"]
-            end_time = state["end_time"]
-            
-            # Create timezone-aware datetime objects
-            timezone_obj = pytz.timezone(TIME_ZONE)
+            person = state.person
+            date = state.date
+            time = state.time
+            end_time = state.end_time
             
             # Create naive datetime first
             start_naive = datetime.datetime.combine(date, time)
             end_naive = datetime.datetime.combine(date, end_time)
             
             # Make them timezone-aware properly
-            start_dt = timezone_obj.localize(start_naive)
-            end_dt = timezone_obj.localize(end_naive)
+            start_dt = _TZ.localize(start_naive)
+            end_dt = _TZ.localize(end_naive)
             
             # Try to find contact if it's a name
             attendees = []
             if "@" not in person:
-                # Try Google Contacts first
-                contact = None
-                try:
-                    contact = self.contacts_service.get_contact_by_name(person)
-                except Exception as e:
-                    print(f"Error finding contact via Google: {e}")
-                
-                # If not found in Google, try local DB
-                if not contact or not contact.get("email"):
-                    try:
-                        contact = self.contacts_db_service.get_contact_by_name(person)
-                    except Exception as e:
-                        print(f"Error finding contact in local DB: {e}")
+                # Google and the local DB are queried concurrently
+                contact = self._find_contact(person)
                 
                 if contact and contact.get("email"):
                     person = contact["name"]
@@ -797,7 +938,7 @@ class MessageHandler:
                         self._send_response(from_number,
                             f"Did you mean '{suggestion}'? Please try again with the correct email."
                         )
-                    del self.user_state[from_number]
+                    self.user_state.pop(from_number, None)
                     return True
                 valid_attendees.append(attendee_email)
                 
@@ -806,8 +947,8 @@ class MessageHandler:
                 summary=f"Meeting with {person}",
                 start_time=start_dt,
                 end_time=end_dt,
-                description=state.get("description", ""),
-                location=state.get("location", ""),
+                description=state.description or "",
+                location=state.location or "",
                 attendees=attendees,
                 send_notifications=True
             )
@@ -831,24 +972,28 @@ class MessageHandler:
                 
                 self._send_response(from_number, response)
                 
-                # Send email with meeting details to attendees
+                # Email the meeting details in the background; the reply above
+                # has already told the user the meeting is booked
                 if attendees and meet_link:
-                    self._send_meeting_email(attendees, person, date, time, end_time, meet_link, state.get("description", ""))
+                    _background_io.submit(
+                        self._send_meeting_email,
+                        attendees, person, date, time, end_time, meet_link, state.description or ""
+                    )
             else:
                 self._send_response(from_number, 
                     f"Failed to schedule meeting: {result.get('error', 'Unknown error')}"
                 )
             
             # Clear state
-            del self.user_state[from_number]
+            self.user_state.pop(from_number, None)
             return True
             
         except Exception as e:
-            print(f"Error booking meeting: {e}")
+            logger.error("Error booking meeting: %s", e)
             self._send_response(from_number, 
                 "I encountered an error while scheduling the meeting. Please try again."
             )
-            del self.user_state[from_number]
+            self.user_state.pop(from_number, None)
             return True
         
     
@@ -867,82 +1012,39 @@ class MessageHandler:
         subject = entities.get("subject")
         body = entities.get("body")
         
+        # Resolved once for both the direct send and the conversation
+        recipient = self._resolve_recipient(email, person)
+        
         # If we have enough information, send the email directly
-        if (person or email) and subject and body:
-            recipient = email[0] if email else None
-            
-            if not recipient and person:
-                # Try Google Contacts first
-                contact = None
-                try:
-                    contact = self.contacts_service.get_contact_by_name(person[0])
-                except Exception as e:
-                    print(f"Error finding contact via Google: {e}")
-                
-                # If not found in Google, try local DB
-                if not contact or not contact.get("email"):
-                    try:
-                        contact = self.contacts_db_service.get_contact_by_name(person[0])
-                    except Exception as e:
-                        print(f"Error finding contact in local DB: {e}")
-                
-                if contact and contact.get("email"):
-                    recipient = contact["email"]
+        if recipient and subject and body:
+            result = self.email_service.send_email(
+                to=recipient,
+                subject=subject,
+                body=body
+            )
             
-            if recipient:
-                result = self.email_service.send_email(
-                    to=recipient,
-                    subject=subject,
-                    body=body
+            if result["success"]:
+                self._send_response(from_number, 
+                    f"Email sent successfully to {recipient}!"
                 )
-                
-                if result["success"]:
-                    self._send_response(from_number, 
-                        f"Email sent successfully to {recipient}!"
-                    )
-                else:
-                    self._send_response(from_number, 
-                        f"Failed to send email: {result.get('error', 'Unknown error')}"
-                    )
-                
-                return
-        
-        # Start conversation to gather missing information
-        recipient = None
-        if email:
-            recipient = email[0]
-        elif person:
-            # Try Google Contacts first
-            contact = None
-            try:
-                contact = self.contacts_service.get_contact_by_name(person[0])
-            except Exception as e:
-                print(f"Error finding contact via Google: {e}")
-            
-            # If not found in Google, try local DB
-            if not contact or not contact.get("email"):
-                try:
-                    contact = self.contacts_db_service.get_contact_by_name(person[0])
-                except Exception as e:
-                    print(f"Error finding contact in local DB: {e}")
-            
-            if contact and contact.get("email"):
-                recipient = contact["email"]
             else:
-                recipient = person[0]
+                self._reply(from_number, "email_failed", error=result.get('error', 'Unknown error'))
+            
+            return
+        
+        # Start conversation to gather missing information; an unresolved
+        # name is looked up again when the user confirms the email
+        if not recipient and person:
+            recipient = person[0]
         
         # Initialize state
-        state = {
-            "type": "email",
-            "step": "recipient" if not recipient else "subject",
-        }
-        
-        if recipient:
-            state["recipient"] = recipient
-        if subject:
-            state["subject"] = subject
-        if body:
-            state["body"] = body
+        state = ConversationState(
+            "email",
+            "recipient" if not recipient else "subject",
+            recipient=recipient or None,
+            subject=subject or None,
+            body=body or None
+        )
         
         self.user_state[from_number] = state
         
@@ -960,6 +1062,27 @@ class MessageHandler:
                 f"What's the content of the email to {recipient}?"
             )
     
+    def _resolve_recipient(self, email, person):
+        """
+        Find the email address to send to from the extracted entities.
+        
+        Args:
+            email: Extracted email addresses
+            person: Extracted person names
+            
+        Returns:
+            Email address, or None if there is none and the person has no
+            contact with an email
+        """
+        if email:
+            return email[0]
+        if person:
+            # Google and the local DB are queried concurrently
+            contact = self._find_contact(person[0])
+            if contact and contact.get("email"):
+                return contact["email"]
+        return None
+    
     def _handle_schedule_meeting(self, from_number, message_text, entities):
         """
         Handle meeting scheduling intent.
@@ -978,29 +1101,19 @@ class MessageHandler:
         subject = entities.get("subject")
         
         # Initialize state
-        state = {
-            "type": "meeting",
-            "step": "person",
-        }
+        state = ConversationState(
+            "meeting",
+            "person",
+            date=date or None,
+            time=time or None,
+            duration=duration or None,
+            location=location or None,
+            description=subject or None
+        )
         
         if person:
-            state["person"] = person[0]
-            state["step"] = "date" if not date else "time"
-        
-        if date:
-            state["date"] = date
-        
-        if time:
-            state["time"] = time
-        
-        if duration:
-            state["duration"] = duration
-        
-        if location:
-            state["location"] = location
-        
-        if subject:
-            state["description"] = subject
+            state.person = person[0]
+            state.step = "date" if not date else "time"
         
         # Save state
         self.user_state[from_number] = state
@@ -1028,7 +1141,7 @@ class MessageHandler:
         """
         try:
             # Get current date if no date is specified
-            now = datetime.datetime.now(pytz.timezone(TIME_ZONE))
+            now = datetime.datetime.now(_TZ)
             query_date = now.date()
             
             if entities and "date" in entities:
@@ -1046,24 +1159,14 @@ class MessageHandler:
                 )
                 return
 
-            # Format response
-            response = f"📅 Here are your events for {format_date(query_date)}:\n\n"
-            for idx, event in enumerate(events, 1):
-                start_time = format_time(event['start'].time()) if isinstance(event['start'], datetime.datetime) else "All day"
-                end_time = format_time(event['end'].time()) if isinstance(event['end'], datetime.datetime) else ""
-                time_str = f"{start_time} - {end_time}" if end_time else start_time
-                
-                response += f"{idx}. {time_str}\n"
-                response += f"   {event['summary']}\n"
-                if event.get('location'):
-                    response += f"   📍 {event['location']}\n"
-                response += "\n"
+            # Format response in one join instead of growing a string per line
+            parts = [f"📅 Here are your events for {format_date(query_date)}:\n\n"]
+            parts.extend(_format_event(idx, event) for idx, event in enumerate(events, 1))
 
-            send_whatsapp_message(from_number, response.strip())
+            send_whatsapp_message(from_number, "".join(parts).strip())
 
         except Exception as e:
-            print(f"Error checking calendar: {e}")
-            traceback.print_exc()
+            logger.exception("Error checking calendar: %s", e)
             send_whatsapp_message(from_number, 
                 "Sorry, I couldn't retrieve your calendar events. Please try again later."
             )
@@ -1082,12 +1185,9 @@ class MessageHandler:
         
         if not person:
             # Extract from message using more general approach
-            words = message_text.split()
-            for i, word in enumerate(words):
-                if word.lower() in ["for", "about", "contact", "email", "address", "phone"]:
-                    if i + 1 < len(words):
-                        person = [" ".join(words[i+1:])]
-                        break
+            match = _CONTACT_LEAD_RE.search(message_text)
+            if match:
+                person = [" ".join(match.group(1).split())]
         
         if not person:
             self._send_response(from_number, 
@@ -1095,71 +1195,74 @@ class MessageHandler:
             )
             return
         
-        # Search for contact
+        # Search the synced local DB first; its FTS index answers in
+        # milliseconds, while Google search pages through every contact
         contacts = []
+        source = self.contacts_db_service
         try:
-            contacts = self.contacts_service.search_contacts(person[0])
+            contacts = source.search_contacts(person[0])
         except Exception as e:
-            print(f"Error searching contacts: {e}")
+            logger.error("Error searching local contacts: %s", e)
+        
+        if not contacts:
+            source = self.contacts_service
+            try:
+                contacts = source.search_contacts(person[0])
+            except Exception as e:
+                logger.error("Error searching contacts: %s", e)
         
         if contacts:
             if len(contacts) == 1:
-                # Get full details
+                # Get full details from wherever the match came from
                 contact_details = None
                 try:
-                    contact_details = self.contacts_service.get_contact_details(contacts[0]["resource_name"])
+                    contact_details = source.get_contact_details(contacts[0]["resource_name"])
                 except Exception as e:
-                    print(f"Error getting contact details: {e}")
+                    logger.error("Error getting contact details: %s", e)
                     contact_details = contacts[0]  # Use basic info if detailed fetch fails
                 
                 if contact_details:
                     # Format details
-                    details_text = f"📇 Contact information for {contact_details['name']}:\n\n"
+                    parts = [f"📇 Contact information for {contact_details['name']}:\n\n"]
                     
                     # Add email(s)
                     if contact_details.get('all_emails'):
-                        details_text += "📧 Email addresses:\n"
-                        for i, email in enumerate(contact_details['all_emails']):
-                            details_text += f"   {i+1}. {email}\n"
+                        parts.append("📧 Email addresses:\n")
+                        parts.extend(f"   {i}. {email}\n" for i, email in enumerate(contact_details['all_emails'], 1))
                     elif contact_details.get('email'):
-                        details_text += f"📧 Email: {contact_details['email']}\n"
+                        parts.append(f"📧 Email: {contact_details['email']}\n")
                     
                     # Add phone(s)
                     if contact_details.get('all_phones'):
-                        details_text += "📱 Phone numbers:\n"
-                        for i, phone in enumerate(contact_details['all_phones']):
-                            details_text += f"   {i+1}. {phone}\n"
+                        parts.append("📱 Phone numbers:\n")
+                        parts.extend(f"   {i}. {phone}\n" for i, phone in enumerate(contact_details['all_phones'], 1))
                     elif contact_details.get('phone'):
-                        details_text += f"📱 Phone: {contact_details['phone']}\n"
+                        parts.append(f"📱 Phone: {contact_details['phone']}\n")
                     
                     # Add other details
-                    details_text += f"🏢 Organization: {contact_details['organization']}\n" if contact_details.get('organization') else ""
-                    details_text += f"📍 Address: {contact_details['address']}" if contact_details.get('address') else ""
+                    if contact_details.get('organization'):
+                        parts.append(f"🏢 Organization: {contact_details['organization']}\n")
+                    if contact_details.get('address'):
+                        parts.append(f"📍 Address: {contact_details['address']}")
                     
-                    self._send_response(from_number, details_text)
+                    self._send_response(from_number, "".join(parts))
                 else:
                     # Format basic info safely
-                    contact_info = f"Found contact: {contacts[0]['name']}"
+                    parts = [f"Found contact: {contacts[0]['name']}"]
                     if contacts[0].get('email'):
-                        contact_info += f" ({contacts[0]['email']})"
+                        parts.append(f" ({contacts[0]['email']})")
                     if contacts[0].get('phone'):
-                        contact_info += f" - {contacts[0]['phone']}"
-                    contact_info += f" - {contacts[0]['address']}"
+                        parts.append(f" - {contacts[0]['phone']}")
+                    if contacts[0].get('address'):
+                        parts.append(f" - {contacts[0]['address']}")
 
-                    self._send_response(from_number, contact_info)
+                    self._send_response(from_number, "".join(parts))
             else:
                 # Multiple contacts found
-                contacts_text = f"Found {len(contacts)} contacts for '{person[0]}':\n\n"
-                
-                for i, contact in enumerate(contacts):
-                    contacts_text += f"{i+1}. {contact['name']}"
-                    if contact.get('email'):
-                        contacts_text += f" ({contact['email']})"
-                    if contact.get('phone'):
-                        contacts_text += f" - {contact['phone']}"
-                    contacts_text += "\n"
+                parts = [f"Found {len(contacts)} contacts for '{person[0]}':\n\n"]
+                parts.extend(_format_contact_line(i, contact) for i, contact in enumerate(contacts, 1))
                 
-                self._send_response(from_number, contacts_text)
+                self._send_response(from_number, "".join(parts))
         else:
             self._send_response(from_number, 
                 f"No contacts found for '{person[0]}'."
@@ -1170,10 +1273,24 @@ class MessageHandler:
         Args:
         to_number: Recipient's phone number
         message: Message content"""
-        print(f"Sending response to {to_number}: {message}")
+        logger.debug("Sending response to %s: %s", to_number, message)
         self.whatsapp_client.send_message(to_number, message)                    
     
     
+    def _reply(self, from_number, code, **fields):
+        """
+        Send one of the _RESPONSES templates to the user.
+        
+        Args:
+            from_number: Recipient's phone number
+            code: Key of the template in _RESPONSES
+            **fields: Values for the template's placeholders
+        """
+        message = _RESPONSES[code]
+        if fields:
+            message = message.format(**fields)
+        self._send_response(from_number, message)
+    
     def _handle_check_free_slots(self, from_number, message_text, entities):
         """
         Handle checking free time slots intent.
@@ -1233,88 +1350,33 @@ class MessageHandler:
             # Create email subject - removed mention of recipient in subject
             subject = f"Meeting Invitation: Meeting on {date_str}"
             
-            # Define the organizer (your assistant's identity)
-            organizer_name = "Your AI Personal Assistant"
-            
             # Create email body in HTML format - removed mentioning the recipient's name
-            body = f"""
-            <html>
-            <body>
-                <h2>Meeting Invitation</h2>
-                <p>You have been invited to a meeting.</p>
-                
-                <h3>Meeting Details:</h3>
-                <ul>
-                    <li><strong>Date:</strong> {date_str}</li>
-                    <li><strong>Time:</strong> {start_str} - {end_str}</li>
-                    <li><strong>Google Meet:</strong> <a href="{meet_link}">{meet_link}</a></li>
-                </ul>
-                
-                <p>You can join the meeting by clicking the Google Meet link above.</p>
-                
-                {f'<h3>Notes:</h3><p>{description}</p>' if description else ''}
-                
-                <p>This invitation was sent by {organizer_name}.</p>
-            </body>
-            </html>
-            """
-            
-            # Send the email
-            result = self.email_service.send_email(
-                to=attendees,
-                subject=subject,
-                body=body
+            body = _MEETING_EMAIL_TEMPLATE.substitute(
+                date=html.escape(date_str),
+                start=html.escape(start_str),
+                end=html.escape(end_str),
+                meet_link=html.escape(meet_link),
+                notes=_MEETING_NOTES_TEMPLATE.substitute(description=html.escape(description)) if description else "",
+                organizer=_MEETING_ORGANIZER
             )
             
-            if result["success"]:
-                print(f"Meeting invitation email sent to {attendees}")
-            else:
-                print(f"Failed to send meeting invitation email: {result.get('error', 'Unknown error')}")
+            # Send the email; this runs in the background, so transient
+            # Gmail API failures can be waited out
+            for attempt in range(1, MEETING_EMAIL_ATTEMPTS + 1):
+                result = self.email_service.send_email(
+                    to=attendees,
+                    subject=subject,
+                    body=body
+                )
+                
+                if result["success"]:
+                    logger.info("Meeting invitation email sent to %s", attendees)
+                    break
+                
+                logger.warning("Failed to send meeting invitation email (attempt %d of %d): %s",
+                               attempt, MEETING_EMAIL_ATTEMPTS, result.get('error', 'Unknown error'))
+                if attempt < MEETING_EMAIL_ATTEMPTS:
+                    sleep(MEETING_EMAIL_BACKOFF * 2 ** (attempt - 1))
             
         except Exception as e:
-            print(f"Error sending meeting email: {e}")
-
-    def _handle_process_tenders(self, from_number, message_text, media_url=None, media_type=None):
-        """
-        Handle tender processing intent.
-        
-        Args:
-            from_number: Sender's phone number
-            message_text: Message content
-            media_url: URL to attached media (optional)
-            media_type: Content type of attached media (optional)
-        """
-        if media_url and media_type:
-            try:
-                # Download and process the file
-                response = requests.get(media_url)
-                if response.status_code == 200:
-                    # Create a temporary file with appropriate extension
-                    ext = '.csv' if 'csv' in media_type.lower() else '.xlsx'
-                    with tempfile.NamedTemporaryFile(suffix=ext, delete=False) as temp_file:
-                        temp_file.write(response.content)
-                        temp_file.flush()
-                        
-                        # Process the tender file
-                        tenders = self.tender_service.process_tender_file(temp_file.name)
-                        results = self.tender_service.process_tenders(tenders, from_number)
-                        
-                        # Clean up
-                        os.unlink(temp_file.name)
-                        
-                else:
-                    send_whatsapp_message(from_number, "Sorry, I couldn't download your file. Please try again.")
-            
-            except Exception as e:
-                send_whatsapp_message(from_number, f"Error processing file: {str(e)}")
-        
-        else:
-            # If no file is attached, ask for one
-            send_whatsapp_message(from_number, 
-                "Please upload a CSV or Excel file containing tender information with the following columns:\n"
-                "- tender_name\n"
-                "- email\n"
-                "- bidding_date"
-            )
-
-
+            logger.error("Error sending meeting email: %s", e)
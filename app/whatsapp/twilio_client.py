@@ -2,19 +2,34 @@
 WhatsApp client integration using Twilio's official API.
 """
 import os
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from twilio.rest import Client
+from twilio.http.http_client import TwilioHttpClient
 from twilio.base.exceptions import TwilioRestException
 
 from app.config import (
     TWILIO_ACCOUNT_SID,
     TWILIO_AUTH_TOKEN,
     TWILIO_PHONE_NUMBER,
-    DEBUG
+    TWILIO_SEND_WORKERS
 )
+from app.utils.http_session import session as http_session
+
+logger = logging.getLogger(__name__)
+
+# Sends rejected with 429 or a 5xx are retried after 1s, 2s, ... (at most 30s)
+SEND_ATTEMPTS = 3
+MAX_SEND_BACKOFF = 30
 
 # Global client instance
 _client = None
 
+# Long-lived threads for sends the caller doesn't wait on, e.g. acknowledgments
+_send_executor = ThreadPoolExecutor(max_workers=TWILIO_SEND_WORKERS, thread_name_prefix="twilio-send")
+
 def get_client():
     """
     Get or create the global Twilio WhatsApp client instance.
@@ -27,6 +42,82 @@ def get_client():
         _client = TwilioWhatsAppClient()
     return _client
 
+def strip_whatsapp_prefix(number):
+    """
+    Turn a Twilio 'whatsapp:+15551234567' address into '15551234567'.
+    
+    Args:
+        number: Address from a Twilio webhook
+        
+    Returns:
+        Phone number with country code but without 'whatsapp:' or '+'
+    """
+    if number.startswith('whatsapp:'):
+        number = number[9:]
+    if number.startswith('+'):
+        number = number[1:]
+    return number
+
+class WebhookMessage:
+    """
+    One incoming WhatsApp message parsed from a Twilio webhook.
+    
+    Only the first media item is kept; the assistant processes one file at
+    a time.
+    """
+    __slots__ = ("message_sid", "from_number", "body", "media_url", "media_type")
+    
+    def __init__(self, message_sid, from_number, body, media_url=None, media_type=None):
+        self.message_sid = message_sid
+        self.from_number = from_number
+        self.body = body
+        self.media_url = media_url
+        self.media_type = media_type
+
+def parse_webhook(form):
+    """
+    Extract the message details from Twilio webhook form data.
+    
+    Args:
+        form: Mapping of the webhook's form fields
+        
+    Returns:
+        WebhookMessage with the sender's number stripped of its prefixes
+    """
+    media_url = None
+    media_type = None
+    if int(form.get('NumMedia', '0')) > 0:
+        media_url = form.get('MediaUrl0')
+        media_type = form.get('MediaContentType0')
+    
+    return WebhookMessage(
+        form.get('MessageSid', ''),
+        strip_whatsapp_prefix(form.get('From', '')),
+        form.get('Body', ''),
+        media_url,
+        media_type
+    )
+
+@lru_cache(maxsize=1024)
+def whatsapp_address(to):
+    """
+    Turn a phone number into the 'whatsapp:+...' address Twilio expects.
+    
+    Cached, since replies go to the same few numbers over and over.
+    
+    Args:
+        to: Phone number with country code but without '+', or an
+            address that already has the 'whatsapp:' prefix
+    
+    Returns:
+        WhatsApp address string
+    """
+    # If it already has the whatsapp: prefix, use as is
+    if to.startswith('whatsapp:'):
+        return to
+    # Otherwise, add the whatsapp: prefix and + for country code
+    return f"whatsapp:+{to}"
+
 def send_whatsapp_message(to, message):
     """
     Helper function to send a WhatsApp message using the global client.
@@ -41,6 +132,19 @@ def send_whatsapp_message(to, message):
     client = get_client()
     return client.send_message(to, message)
 
+def send_whatsapp_message_async(to, message):
+    """
+    Send a WhatsApp message from a pooled background thread.
+    
+    Args:
+        to: Phone number with country code but without '+'
+        message: Message text to send
+    
+    Returns:
+        Future resolving to the send_message result dict
+    """
+    return _send_executor.submit(send_whatsapp_message, to, message)
+
 class TwilioWhatsAppClient:
     def __init__(self, on_message=None):
         """
@@ -57,16 +161,26 @@ class TwilioWhatsAppClient:
         # Initialize Twilio client
         if self.account_sid and self.auth_token:
             try:
-                self.client = Client(self.account_sid, self.auth_token)
+                # Pooled HTTP client so every send reuses the same TLS connection
+                http_client = TwilioHttpClient(pool_connections=True, timeout=30)
+                # Share the process-wide session with media downloads, which
+                # also go to api.twilio.com; its pool has room for every worker
+                # thread sending at once, and POSTs are only retried when the
+                # connection itself fails
+                http_client.session = http_session
+                self.client = Client(
+                    self.account_sid,
+                    self.auth_token,
+                    http_client=http_client
+                )
                 self.initialized = True
-                if DEBUG:
-                    print("Twilio WhatsApp client initialized successfully")
+                logger.debug("Twilio WhatsApp client initialized successfully")
             except Exception as e:
-                print(f"Error initializing Twilio client: {e}")
+                logger.error("Error initializing Twilio client: %s", e)
                 self.client = None
                 self.initialized = False
         else:
-            print("Twilio credentials not found. Set TWILIO_ACCOUNT_SID and TWILIO_AUTH_TOKEN environment variables.")
+            logger.error("Twilio credentials not found. Set TWILIO_ACCOUNT_SID and TWILIO_AUTH_TOKEN environment variables.")
             self.client = None
             self.initialized = False
     
@@ -87,31 +201,35 @@ class TwilioWhatsAppClient:
         
         try:
             # Format the 'to' number for WhatsApp
-            # If it already has the whatsapp: prefix, use as is
-            if to.startswith('whatsapp:'):
-                to_formatted = to
-            else:
-                # Otherwise, add the whatsapp: prefix and + for country code
-                to_formatted = f"whatsapp:+{to}"
+            to_formatted = whatsapp_address(to)
             
-            # Send the message
-            message = self.client.messages.create(
-                from_=self.phone_number,
-                body=message,
-                to=to_formatted
-            )
+            # Send the message, retrying when Twilio is throttling or failing
+            for attempt in range(1, SEND_ATTEMPTS + 1):
+                try:
+                    sent = self.client.messages.create(
+                        from_=self.phone_number,
+                        body=message,
+                        to=to_formatted
+                    )
+                    break
+                except TwilioRestException as e:
+                    retryable = e.status == 429 or e.status >= 500
+                    if not retryable or attempt == SEND_ATTEMPTS:
+                        raise
+                    logger.warning("Twilio API error (attempt %d of %d), retrying: %s", attempt, SEND_ATTEMPTS, e)
+                    time.sleep(min(2 ** (attempt - 1), MAX_SEND_BACKOFF))
             
             return {
                 "success": True,
-                "message_sid": message.sid,
-                "status": message.status
+                "message_sid": sent.sid,
+                "status": sent.status
             }
             
         except TwilioRestException as e:
-            print(f"Twilio API error: {e}")
+            logger.error("Twilio API error: %s", e)
             return {"success": False, "error": f"Twilio API error: {e}"}
         except Exception as e:
-            print(f"Error sending WhatsApp message: {e}")
+            logger.exception("Error sending WhatsApp message: %s", e)
             return {"success": False, "error": f"Error sending message: {e}"}
     
     def process_incoming_webhook(self, request_data):
@@ -122,32 +240,17 @@ class TwilioWhatsAppClient:
             request_data: The request data from Twilio webhook
             
         Returns:
-            Dict containing message information
+            WebhookMessage with the message information
         """
         try:
-            # Extract message details from the webhook data
-            message_sid = request_data.get('MessageSid', '')
-            from_number = request_data.get('From', '')
-            body = request_data.get('Body', '')
-            
-            # Remove WhatsApp prefix from the phone number if present
-            if from_number.startswith('whatsapp:'):
-                from_number = from_number.replace('whatsapp:', '')
-            
-            # Remove the + from the phone number if present
-            if from_number.startswith('+'):
-                from_number = from_number[1:]
+            message = parse_webhook(request_data)
             
             # Call the message callback if provided (for testing)
             if self.on_message_callback:
-                self.on_message_callback(from_number, body)
+                self.on_message_callback(message.from_number, message.body)
             
-            return {
-                "message_sid": message_sid,
-                "from": from_number,
-                "body": body
-            }
+            return message
             
         except Exception as e:
-            print(f"Error processing webhook data: {e}")
+            logger.exception("Error processing webhook data: %s", e)
             return None
\ No newline at end of file
@@ -1,11 +1,42 @@
 """
 Flask server for handling Twilio WhatsApp webhooks.
 """
+import queue
+import logging
 import threading
-from flask import Flask, request
-from twilio.twiml.messaging_response import MessagingResponse
+from flask import Flask, Response, request
+from werkzeug.serving import make_server
+from twilio.request_validator import RequestValidator
 
-from app.config import SERVER_HOST, SERVER_PORT, DEBUG
+from app.config import (
+    SERVER_HOST,
+    SERVER_PORT,
+    WEBHOOK_WORKERS,
+    WEBHOOK_QUEUE_SIZE,
+    TWILIO_AUTH_TOKEN,
+    TWILIO_WEBHOOK_URL
+)
+from app.whatsapp.twilio_client import parse_webhook, send_whatsapp_message_async
+
+logger = logging.getLogger(__name__)
+
+# Load balancers probe /health constantly, so its response is built once;
+# no-store keeps caches from answering for a server that's down
+_HEALTH_OK = Response(b"OK", status=200, mimetype='text/plain', headers={'Cache-Control': 'no-store'})
+
+# Replies are sent through the REST API, so every webhook answers with the
+# same empty TwiML document (what str(MessagingResponse()) renders)
+_EMPTY_TWIML = Response(
+    b'<?xml version="1.0" encoding="UTF-8"?><Response />',
+    status=200,
+    mimetype='application/xml'
+)
+
+# Sent when a sender's worker queue is full and their message is dropped
+_BUSY_MESSAGE = "Sorry, I'm handling a lot of messages right now. Please send that again in a minute."
+
+# Checks X-Twilio-Signature; without an auth token (local testing) nothing is checked
+_validator = RequestValidator(TWILIO_AUTH_TOKEN) if TWILIO_AUTH_TOKEN else None
 
 class WebhookServer:
     def __init__(self, message_handler):
@@ -17,9 +48,20 @@ class WebhookServer:
         """
         self.app = Flask(__name__)
         self.message_handler = message_handler
+        self.server = None
         self.server_thread = None
         self.running = False
         
+        # Messages wait here for a worker so the webhook can return at once.
+        # Each worker has its own queue and a sender always maps to the same
+        # one, so one sender's messages are handled in order without holding
+        # up other workers; the bounds keep a flood from piling up in memory
+        shard_size = max(1, WEBHOOK_QUEUE_SIZE // WEBHOOK_WORKERS)
+        self.queues = [queue.Queue(maxsize=shard_size) for _ in range(WEBHOOK_WORKERS)]
+        self.workers = []
+        if self.message_handler:
+            self._start_workers()
+        
         # Register routes
         self.app.route('/webhook', methods=['POST'])(self.handle_webhook)
         self.app.route('/health', methods=['GET'])(self.health_check)
@@ -28,60 +70,75 @@ class WebhookServer:
         """
         Handle incoming webhook requests from Twilio.
         """
-        # Create a TwiML response
-        resp = MessagingResponse()
+        # Twilio signs the public URL it was configured with, which differs
+        # from request.url behind a proxy or tunnel
+        signature = request.headers.get('X-Twilio-Signature', '')
+        if _validator and not _validator.validate(TWILIO_WEBHOOK_URL or request.url, request.form, signature):
+            logger.warning("Rejected webhook with an invalid Twilio signature")
+            return "Forbidden", 403
         
         try:
-            # Process the incoming message
-            form_data = request.form.to_dict()
+            # Read fields straight from the form; a dict copy is only made
+            # when the payload is actually logged
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Received webhook: %s", request.form.to_dict())
             
-            if DEBUG:
-                print(f"Received webhook: {form_data}")
+            # Extract message details, including the first media item if any
+            message = parse_webhook(request.form)
             
-            # Extract message details
-            from_number = form_data.get('From', '')
-            message_body = form_data.get('Body', '')
-            
-            # Remove WhatsApp prefix from the phone number if present
-            if from_number.startswith('whatsapp:'):
-                from_number = from_number.replace('whatsapp:', '')
-            
-            # Remove the + from the phone number if present
-            if from_number.startswith('+'):
-                from_number = from_number[1:]
-            
-            # Check for media attachments
-            num_media = int(form_data.get('NumMedia', '0'))
-            media_url = None
-            media_type = None
-            
-            if num_media > 0:
-                # Get the first media item (we'll only process one file at a time)
-                media_url = form_data.get('MediaUrl0')
-                media_type = form_data.get('MediaContentType0')
-                
-                if DEBUG:
-                    print(f"Media received: {media_type} from {media_url}")
+            if message.media_url:
+                logger.debug("Media received: %s from %s", message.media_type, message.media_url)
             
             # Pass to message handler
             if self.message_handler:
-                # Process in a separate thread to avoid blocking the response
-                threading.Thread(
-                    target=self.message_handler,
-                    args=(from_number, message_body, media_url, media_type)
-                ).start()
+                # Queue for the sender's worker to avoid blocking the response
+                jobs = self.queues[hash(message.from_number) % len(self.queues)]
+                jobs.put_nowait((message.from_number, message.body, message.media_url, message.media_type))
             
+        except queue.Full:
+            # Twilio does not retry a failed webhook unless a fallback URL is
+            # configured, so a 503 would lose the message silently; drop it
+            # but tell the sender to resend
+            logger.warning("Webhook queue full for %s; dropping message", message.from_number)
+            send_whatsapp_message_async(message.from_number, _BUSY_MESSAGE)
         except Exception as e:
-            print(f"Error handling webhook: {e}")
+            logger.exception("Error handling webhook: %s", e)
         
         # Return empty response (processing happens asynchronously)
-        return str(resp)
+        return _EMPTY_TWIML
+    
+    def _start_workers(self):
+        """
+        Start the worker threads that run the message handler.
+        """
+        for i, jobs in enumerate(self.queues):
+            worker = threading.Thread(target=self._work, args=(jobs,), name=f"webhook-worker-{i}")
+            worker.daemon = True  # Thread will exit when main thread exits
+            worker.start()
+            self.workers.append(worker)
+    
+    def _work(self, jobs):
+        """
+        Handle queued messages until the application exits.
+        
+        Args:
+            jobs: The queue this worker owns
+        """
+        while True:
+            from_number, message_body, media_url, media_type = jobs.get()
+            try:
+                self.message_handler(from_number, message_body, media_url, media_type)
+            except Exception as e:
+                # One failing message must not take the worker down with it
+                logger.exception("Error in webhook worker: %s", e)
+            finally:
+                jobs.task_done()
     
     def health_check(self):
         """
         Health check endpoint.
         """
-        return "OK", 200
+        return _HEALTH_OK
     
     def start(self):
         """
@@ -91,15 +148,11 @@ class WebhookServer:
             print("Webhook server is already running")
             return
         
-        def run_server():
-            self.app.run(
-                host=SERVER_HOST,
-                port=SERVER_PORT,
-                debug=False,  # Always set to False in production
-                use_reloader=False  # Disable reloader to avoid starting multiple threads
-            )
+        # Keep a handle on the server so stop() can shut it down; binding
+        # here also surfaces a busy port to the caller instead of a thread
+        self.server = make_server(SERVER_HOST, SERVER_PORT, self.app, threaded=True)
         
-        self.server_thread = threading.Thread(target=run_server)
+        self.server_thread = threading.Thread(target=self.server.serve_forever, name="webhook-server")
         self.server_thread.daemon = True  # Thread will exit when main thread exits
         self.server_thread.start()
         self.running = True
@@ -111,7 +164,15 @@ class WebhookServer:
         """
         Stop the webhook server.
         """
+        if not self.running:
+            return
+        
         self.running = False
-        # Note: Flask doesn't have a clean way to stop from another thread
-        # The server will be terminated when the main thread exits
-        print("Webhook server will stop when the application exits")
\ No newline at end of file
+        # Stop accepting requests; messages already queued are left to the
+        # daemon worker threads until the application exits
+        self.server.shutdown()
+        self.server.server_close()
+        self.server_thread.join(timeout=5)
+        self.server = None
+        self.server_thread = None
+        print("Webhook server stopped")
\ No newline at end of file